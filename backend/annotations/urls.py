@@ -0,0 +1,12 @@
+from django.urls import path
+
+from .views import enqueue_test, health, job_status
+
+urlpatterns = [
+    # 健康檢查
+    path('health', health),
+
+    # RQ 測試端點
+    path('jobs/test', enqueue_test),
+    path('jobs/<str:jid>', job_status),
+]
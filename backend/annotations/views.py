@@ -1,33 +1,50 @@
 # backend/annotations/views.py
-from django.http import JsonResponse
-from django.conf import settings
+from asgiref.sync import sync_to_async
+
+from config.responses import json_response
 
 # === 健康檢查（M0 驗收用） ===
-def health(request):
-    return JsonResponse({"ok": True, "service": "backend", "version": 1})
+async def health(request):
+    return json_response({"ok": True, "service": "backend", "version": 1})
 
 # === RQ 佇列最小測試（M6 會換成真正 PaddleOCR 任務） ===
 import time
-from redis import Redis
 from rq import Queue
 from rq.job import Job
 
-redis_conn = Redis.from_url(settings.REDIS_URL)
-q = Queue('ocr', connection=redis_conn)
+from jobs.queue import get_connection, get_queue
 
 def _demo_ocr_page(item_id: int):
     time.sleep(2)  # 模擬耗時
     return {"item_id": item_id, "text": "OK"}
 
-def enqueue_test(request):
-    job = q.enqueue(_demo_ocr_page, 123)  # 丟一個假 item_id
-    return JsonResponse({"ok": True, "job_id": job.get_id()})
+def _enqueue_demo_jobs(count: int) -> dict:
+    q = get_queue('ocr')
+    if count == 1:
+        job = q.enqueue(_demo_ocr_page, 123)  # 丟一個假 item_id
+        return {"ok": True, "job_id": job.get_id()}
+    # 多筆時以 enqueue_many 一次送出（單一 pipeline）
+    jobs = q.enqueue_many([Queue.prepare_data(_demo_ocr_page, args=(123 + i,)) for i in range(count)])
+    return {"ok": True, "job_ids": [job.get_id() for job in jobs]}
 
-def job_status(request, jid: str):
-    job = Job.fetch(jid, connection=redis_conn)
-    return JsonResponse({
+def _job_status_payload(jid: str) -> dict:
+    job = Job.fetch(jid, connection=get_connection(), serializer=get_queue('ocr').serializer)
+    return {
         "ok": True,
         "id": job.id,
         "status": job.get_status(),
         "result": job.result if job.is_finished else None
-    })
+    }
+
+# Redis 呼叫為阻塞 I/O，在 ASGI 下改以 thread 執行，避免佔住 event loop
+async def enqueue_test(request):
+    try:
+        count = max(1, min(int(request.GET.get("count", "1")), 100))
+    except ValueError:
+        count = 1
+    payload = await sync_to_async(_enqueue_demo_jobs, thread_sensitive=False)(count)
+    return json_response(payload)
+
+async def job_status(request, jid: str):
+    payload = await sync_to_async(_job_status_payload, thread_sensitive=False)(jid)
+    return json_response(payload)
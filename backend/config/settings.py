@@ -110,3 +110,20 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 # === Workspace 設定（M1） ===
 WORKSPACES_ROOT = Path(os.getenv("WORKSPACES_ROOT", BASE_DIR.parent / "workspace_samples"))
 WORKSPACE_STATE_FILE = Path(os.getenv("WORKSPACE_STATE_FILE", BASE_DIR / ".runtime" / "workspace_state.json"))
+# 縮圖改由 nginx 以 X-Accel-Redirect 送出：設為 internal location 的前綴（alias 到 WORKSPACES_ROOT）；留空則由 Django 串流
+THUMBNAIL_ACCEL_REDIRECT_PREFIX = os.getenv("THUMBNAIL_ACCEL_REDIRECT_PREFIX", "")
+# 上傳後是否在背景預先產生縮圖（預設關閉；關閉時縮圖於首次瀏覽時產生）
+THUMBNAIL_PREWARM = os.getenv("THUMBNAIL_PREWARM", "0").lower() in ("1", "true", "yes")
+
+# === Logging（OCR 服務預設只輸出警告；啟動資訊另用 ocr.startup） ===
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "jobs.ocr_service": {"handlers": ["console"], "level": os.getenv("OCR_LOG_LEVEL", "WARNING"), "propagate": False},
+        "ocr.startup": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
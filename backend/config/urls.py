@@ -15,73 +15,17 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
-from annotations.views import health, enqueue_test, job_status
-from jobs.views import job_cancel, job_detail, job_retry, jobs_collection, jobs_clear, item_reocr
-from records.views import (
-    available_workspaces,
-    create_workspace_view,
-    current_workspace,
-    export_workspace_view,
-    import_workspace_view,
-    item_annotations_view,
-    item_completed_view,
-    item_metadata_batch_view,
-    item_metadata_view,
-    item_original,
-    item_thumbnail,
-    list_items_view,
-    open_workspace,
-    record_upload_cancel_view,
-    record_upload_commit_view,
-    record_upload_preview_view,
-    record_detail_view,
-    record_annotations_clear_view,
-    records_root,
-    record_metadata_view,
-    update_workspace,
-)
+from django.urls import include, path
 
 urlpatterns = [
     path('admin/', admin.site.urls),
 
-    # 健康檢查
-    path('api/health', health),
+    # 健康檢查與 RQ 測試端點
+    path('api/', include('annotations.urls')),
 
-    # RQ 測試端點
-    path('api/jobs/test', enqueue_test),
-    path('api/jobs/<str:jid>', job_status),
+    # Jobs / Item Re-OCR
+    path('api/v1/', include('jobs.urls')),
 
-    # Jobs API
-    path('api/v1/jobs', jobs_collection),
-    path('api/v1/jobs/clear', jobs_clear),
-    path('api/v1/jobs/<str:job_id>', job_detail),
-    path('api/v1/jobs/<str:job_id>/retry', job_retry),
-    path('api/v1/jobs/<str:job_id>/cancel', job_cancel),
-
-    # Item Re-OCR
-    path('api/v1/items/<path:item_id>/reocr', item_reocr),
-
-    # Workspace / Items
-    path('api/v1/workspaces', available_workspaces),
-    path('api/v1/workspaces/create', create_workspace_view),
-    path('api/v1/workspaces/import', import_workspace_view),
-    path('api/v1/workspace', current_workspace),
-    path('api/v1/workspace/open', open_workspace),
-    path('api/v1/workspaces/<str:slug>/export', export_workspace_view),
-    path('api/v1/workspaces/<str:slug>', update_workspace),
-    path('api/v1/records', records_root),
-    path('api/v1/records/upload/preview', record_upload_preview_view),
-    path('api/v1/records/upload/commit', record_upload_commit_view),
-    path('api/v1/records/upload/cancel', record_upload_cancel_view),
-    path('api/v1/records/<str:record_slug>', record_detail_view),
-    path('api/v1/records/<str:record_slug>/annotations/clear', record_annotations_clear_view),
-    path('api/v1/records/<str:record_slug>/metadata', record_metadata_view),
-    path('api/v1/items', list_items_view),
-    path('api/v1/items/thumbnail', item_thumbnail),
-    path('api/v1/items/raw', item_original),
-    path('api/v1/items/<path:item_id>/annotations', item_annotations_view),
-    path('api/v1/items/<path:item_id>/completed', item_completed_view),
-    path('api/v1/items/<path:item_id>/metadata', item_metadata_view),
-    path('api/v1/items/metadata/batch', item_metadata_batch_view),
+    # Workspace / Records / Items
+    path('api/v1/', include('records.urls')),
 ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_alter_job_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', '-created_at'], name='job_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['workspace_slug', 'status'], name='job_ws_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('rq_job_id__gt', '')), fields=['rq_job_id'], name='job_rqid_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+def backfill_hot_columns(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    updated = []
+    for job in Job.objects.only('id', 'record_slug', 'job_type', 'payload').iterator():
+        payload = job.payload if isinstance(job.payload, dict) else {}
+        pages = payload.get('pages')
+        if isinstance(pages, int) and pages >= 0:
+            job.page_count = pages
+        elif payload.get('item_id'):
+            job.page_count = 1
+        if job.job_type == 'reocr' and isinstance(payload.get('item_id'), str):
+            job.source_path = f"records/{payload['item_id'].replace('/', '/pages/', 1)}"
+        elif job.record_slug:
+            job.source_path = f'records/{job.record_slug}'
+        updated.append(job)
+    Job.objects.bulk_update(updated, ['page_count', 'source_path'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='page_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='retry_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='source_path',
+            field=models.CharField(blank=True, max_length=1024),
+        ),
+        migrations.RunPython(backfill_hot_columns, migrations.RunPython.noop),
+    ]
@@ -28,6 +28,9 @@ class Job(models.Model):
     created_by = models.CharField(max_length=255, blank=True)
     rq_job_id = models.CharField(max_length=128, blank=True)
     error_message = models.TextField(blank=True)
+    page_count = models.PositiveIntegerField(default=0)
+    retry_count = models.PositiveSmallIntegerField(default=0)
+    source_path = models.CharField(max_length=1024, blank=True)
     payload = models.JSONField(default=dict, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
@@ -36,6 +39,15 @@ class Job(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["status", "-created_at"], name="job_status_created_idx"),
+            models.Index(fields=["workspace_slug", "status"], name="job_ws_status_idx"),
+            models.Index(
+                fields=["rq_job_id"],
+                condition=models.Q(rq_job_id__gt=""),
+                name="job_rqid_idx",
+            ),
+        ]
 
     def mark_running(self):
         if self.status != self.Status.RUNNING:
@@ -53,3 +65,7 @@ class Job(models.Model):
         if message:
             self.error_message = message
         self.finished_at = timezone.now()
+
+    def mark_canceled(self):
+        self.status = self.Status.CANCELED
+        self.finished_at = timezone.now()
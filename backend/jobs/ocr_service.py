@@ -5,11 +5,22 @@ Provides OCR functionality using PaddleOCR with support for both CPU and GPU.
 """
 from __future__ import annotations
 
+import hashlib
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+import cv2
+import numpy as np
+import orjson
 from paddleocr import PaddleOCR, TextRecognition
+from redis import RedisError
+
+from jobs.queue import get_connection
 
 try:
     import paddleocr
@@ -19,6 +30,152 @@ except (ImportError, AttributeError):
 
 DEFAULT_LABEL = "text"
 
+_PRIMARY_RESULT_KEYS = frozenset({"rec_polys", "rec_texts", "rec_scores"})
+
+logger = logging.getLogger(__name__)
+startup_logger = logging.getLogger("ocr.startup")
+
+# Seconds to keep OCR results keyed by image content; 0 disables the cache
+OCR_CACHE_TTL = int(os.getenv("OCR_CACHE_TTL", str(7 * 24 * 3600)))
+OCR_CACHE_PREFIX = "ocr:v1"
+
+
+ImageInput = Union[str, Path, bytes, np.ndarray]
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _read_image_input(image: ImageInput) -> Tuple[str, Any]:
+    """
+    Return ``(content_hash, source)`` for an OCR input.
+
+    Paths are read once so the same bytes serve both the cache key and the
+    decode; ndarrays are hashed from their raw buffer and passed through.
+    """
+    if isinstance(image, np.ndarray):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(image.shape).encode())
+        digest.update(np.ascontiguousarray(image).tobytes())
+        return digest.hexdigest(), image
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        data = bytes(image)
+    else:
+        with open(image, "rb") as fh:
+            data = fh.read()
+    return _content_hash(data), data
+
+
+def _decode_image_input(source: Any, fallback: ImageInput) -> Any:
+    """Decode in-memory bytes to a BGR ndarray, falling back to the original path."""
+    if not isinstance(source, bytes):
+        return source
+    decoded = cv2.imdecode(np.frombuffer(source, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if decoded is not None:
+        return decoded
+    if isinstance(fallback, (str, Path)):
+        return str(fallback)
+    raise ValueError("Unable to decode image bytes for OCR.")
+
+
+def _engine_fingerprint() -> str:
+    """
+    Short digest of every setting that selects the OCR models, plus the PaddleOCR version.
+
+    It is part of each cache key, so switching language, precision, model directories or
+    device starts a fresh namespace instead of serving results from the previous models.
+    """
+    settings = (
+        PADDLEOCR_VERSION,
+        os.getenv("OCR_LANG", "chinese_cht"),
+        os.getenv("OCR_PRECISION", "fp32").lower(),
+        os.getenv("OCR_DET_INT8_MODEL_DIR", ""),
+        os.getenv("OCR_REC_INT8_MODEL_DIR", ""),
+        os.getenv("OCR_REC_MODEL", ""),
+        OCRService._resolve_device(),
+    )
+    return hashlib.blake2b("\0".join(settings).encode(), digest_size=8).hexdigest()
+
+
+def _cache_key(fingerprint: str, content_hash: str) -> str:
+    return f"{OCR_CACHE_PREFIX}:{fingerprint}:{content_hash}"
+
+
+def _decode_cached(cached: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    if not cached:
+        return None
+    try:
+        payload = orjson.loads(cached)
+    except orjson.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _cache_get_many(fingerprint: str, content_hashes: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+    """Cached results for ``content_hashes`` in order, fetched with a single MGET."""
+    if OCR_CACHE_TTL <= 0 or not content_hashes:
+        return [None] * len(content_hashes)
+    try:
+        values = get_connection().mget([_cache_key(fingerprint, h) for h in content_hashes])
+    except RedisError:
+        return [None] * len(content_hashes)
+    return [_decode_cached(value) for value in values]
+
+
+def _cache_set_many(fingerprint: str, results: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+    """Store ``(content_hash, result)`` pairs in one pipelined round-trip."""
+    if OCR_CACHE_TTL <= 0 or not results:
+        return
+    try:
+        pipe = get_connection().pipeline(transaction=False)
+        for content_hash, result in results:
+            try:
+                encoded = orjson.dumps(result)
+            except TypeError:
+                # Unserializable payloads are simply not cached.
+                continue
+            pipe.setex(_cache_key(fingerprint, content_hash), OCR_CACHE_TTL, encoded)
+        pipe.execute()
+    except RedisError:
+        # Caching is best-effort; a Redis outage just skips it.
+        return
+
+
+def _stack_points(polygons: Any) -> Optional[List[List[List[float]]]]:
+    """
+    Convert a batch of polygons into nested float lists with one NumPy cast.
+
+    Returns None when the polygons are ragged or not numeric so callers can
+    fall back to per-point validation.
+    """
+    if not isinstance(polygons, list) or not polygons:
+        return None
+    try:
+        array = np.asarray(polygons)
+    except (TypeError, ValueError):
+        return None
+    if array.dtype.kind not in "biuf":
+        return None
+    if array.ndim != 3 or array.shape[1] == 0 or array.shape[-1] != 2:
+        return None
+    return array.astype(np.float64).tolist()
+
+
+def _normalize_points(points: Any) -> List[List[float]]:
+    normalized_points: List[List[float]] = []
+    if not isinstance(points, list):
+        return normalized_points
+    for point in points:
+        if (
+            isinstance(point, (list, tuple))
+            and len(point) >= 2
+            and isinstance(point[0], (int, float))
+            and isinstance(point[1], (int, float))
+        ):
+            normalized_points.append([float(point[0]), float(point[1])])
+    return normalized_points
+
 
 class OCRService:
     """
@@ -29,12 +186,40 @@ class OCRService:
 
     _instance: Optional[PaddleOCR] = None
     _rec_instance: Optional[TextRecognition] = None
+    _lock = threading.Lock()
+    # PaddleOCR predictors are not documented as thread-safe; serialize inference
+    # while file reads, decoding and result parsing overlap across threads.
+    _inference_lock = threading.Lock()
 
     @staticmethod
     def _resolve_device() -> str:
         use_gpu_env = os.getenv("USE_GPU", "0").lower()
         return "gpu" if use_gpu_env in ("1", "true", "yes") else "cpu"
 
+    @classmethod
+    def is_cpu(cls) -> bool:
+        """Whether the OCR engines run on CPU (USE_GPU unset or false)."""
+        return cls._resolve_device() == "cpu"
+
+    @staticmethod
+    def _resolve_model_dirs() -> tuple[Optional[str], Optional[str]]:
+        """
+        Pick detection/recognition model directories.
+
+        OCR_PRECISION=int8 selects the quantized exports given by
+        OCR_DET_INT8_MODEL_DIR / OCR_REC_INT8_MODEL_DIR; otherwise the
+        default FP32 mobile models are used.
+        """
+        precision = os.getenv("OCR_PRECISION", "fp32").lower()
+        if precision != "int8":
+            return None, None
+
+        det_model_dir = os.getenv("OCR_DET_INT8_MODEL_DIR") or None
+        rec_model_dir = os.getenv("OCR_REC_INT8_MODEL_DIR") or None
+        if not det_model_dir and not rec_model_dir:
+            logger.warning("OCR_PRECISION=int8 but no INT8 model directories configured; using FP32 models")
+        return det_model_dir, rec_model_dir
+
     @classmethod
     def get_ocr_engine(cls) -> PaddleOCR:
         """
@@ -43,78 +228,189 @@ class OCRService:
         Environment Variables:
             USE_GPU: Set to '1' or 'true' to use GPU (default: 'cpu')
             OCR_LANG: Language for OCR (default: 'ch' for Chinese)
+            OCR_CPU_THREADS: Inference threads when running on CPU (optional)
+            OCR_PRECISION: 'int8' to load quantized models (default: 'fp32')
 
         Returns:
             Configured PaddleOCR instance
         """
         if cls._instance is None:
-            device = cls._resolve_device()
-
-            # Get language setting (default to Traditional Chinese)
-            lang = os.getenv("OCR_LANG", "chinese_cht")
-
-            # Initialize PaddleOCR with PaddleOCR 3.x parameters
-            # Use mobile models for lower memory usage
-            cls._instance = PaddleOCR(
-                use_angle_cls=False,  # Disable angle classification to save memory
-                lang=lang,  # Language: 'ch', 'en', 'japan', 'korean', etc.
-                device=device,  # Device: 'cpu' or 'gpu'
-                det_model_dir=None,  # Use default mobile detection model
-                rec_model_dir=None,  # Use default mobile recognition model
-                use_doc_orientation_classify=False,
-                use_doc_unwarping=False,
-            )
-
-            print("✓ PaddleOCR initialized successfully")
-            print(f"  Device: {device.upper()}")
-            print(f"  Language: {lang}")
+            with cls._lock:
+                # Re-check under the lock so concurrent first calls build one engine.
+                if cls._instance is None:
+                    cls._instance = cls._create_ocr_engine()
 
         return cls._instance
 
+    @classmethod
+    def _create_ocr_engine(cls) -> PaddleOCR:
+        device = cls._resolve_device()
+
+        # Get language setting (default to Traditional Chinese)
+        lang = os.getenv("OCR_LANG", "chinese_cht")
+
+        engine_kwargs: Dict[str, Any] = {}
+        cpu_threads = os.getenv("OCR_CPU_THREADS")
+        if device == "cpu" and cpu_threads:
+            engine_kwargs["cpu_threads"] = max(1, int(cpu_threads))
+
+        det_model_dir, rec_model_dir = cls._resolve_model_dirs()
+        if device == "cpu" and (det_model_dir or rec_model_dir):
+            # Quantized models rely on oneDNN INT8 kernels on CPU
+            engine_kwargs["enable_mkldnn"] = True
+
+        # Initialize PaddleOCR with PaddleOCR 3.x parameters
+        # Use mobile models for lower memory usage
+        engine = PaddleOCR(
+            use_angle_cls=False,  # Disable angle classification to save memory
+            lang=lang,  # Language: 'ch', 'en', 'japan', 'korean', etc.
+            device=device,  # Device: 'cpu' or 'gpu'
+            det_model_dir=det_model_dir,  # None: use default mobile detection model
+            rec_model_dir=rec_model_dir,  # None: use default mobile recognition model
+            use_doc_orientation_classify=False,
+            use_doc_unwarping=False,
+            **engine_kwargs,
+        )
+
+        startup_logger.info("✓ PaddleOCR initialized successfully (device=%s, lang=%s)", device.upper(), lang)
+        if det_model_dir or rec_model_dir:
+            startup_logger.info(
+                "  Models: det=%s, rec=%s", det_model_dir or "default", rec_model_dir or "default"
+            )
+
+        return engine
+
     @classmethod
     def get_text_recognition_engine(cls) -> TextRecognition:
         """Get or create the singleton PaddleOCR TextRecognition instance."""
 
         if cls._rec_instance is None:
-            device = cls._resolve_device()
-            rec_model = os.getenv("OCR_REC_MODEL") or None
+            with cls._lock:
+                if cls._rec_instance is None:
+                    cls._rec_instance = cls._create_text_recognition_engine()
 
-            cls._rec_instance = TextRecognition(
-                model_name=rec_model,
-                device=device,
-            )
+        return cls._rec_instance
+
+    @classmethod
+    def _create_text_recognition_engine(cls) -> TextRecognition:
+        device = cls._resolve_device()
+        rec_model = os.getenv("OCR_REC_MODEL") or None
 
-            print("✓ PaddleOCR TextRecognition initialized")
-            print(f"  Device: {device.upper()}")
-            if rec_model:
-                print(f"  Model: {rec_model}")
+        engine = TextRecognition(
+            model_name=rec_model,
+            device=device,
+        )
 
-        return cls._rec_instance
+        startup_logger.info("✓ PaddleOCR TextRecognition initialized (device=%s)", device.upper())
+        if rec_model:
+            startup_logger.info("  Model: %s", rec_model)
+
+        return engine
 
     @classmethod
-    def run_ocr(cls, image_path: str | Path) -> Dict[str, Any]:
+    def run_ocr(cls, image: ImageInput, *, use_cache: bool = True) -> Dict[str, Any]:
         """
         Run OCR on a single image.
 
         Args:
-            image_path: Path to the image file
+            image: Path to the image file, encoded image bytes, or a decoded
+                BGR ndarray
+            use_cache: See run_ocr_batch()
 
         Returns:
             Dict with detection results and metadata.
         """
-        ocr = cls.get_ocr_engine()
-        image_path = str(image_path)
+        return cls.run_ocr_batch([image], use_cache=use_cache)[0]
+
+    @classmethod
+    def run_ocr_batch(cls, images: List[ImageInput], *, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Run OCR on several images with a single engine call.
 
-        # Run OCR
-        result = ocr.ocr(image_path)
+        Results are cached in Redis by image content hash and model settings, so
+        identical pages (retries, repeated covers) skip inference entirely. Each
+        image is read at most once and handed to PaddleOCR as a decoded ndarray.
+
+        Args:
+            images: Image paths, encoded image bytes, or decoded BGR ndarrays
+            use_cache: False skips the lookup and runs every image; the fresh
+                results still replace whatever was cached
 
+        Returns:
+            One dict per input image, in the same order, shaped like run_ocr()
+            plus ``content_hash`` and ``cached`` keys.
+        """
+        if not images:
+            return []
+
+        inputs = [_read_image_input(image) for image in images]
+        hashes = [content_hash for content_hash, _source in inputs]
+        fingerprint = _engine_fingerprint()
+        parsed: List[Optional[Dict[str, Any]]] = (
+            _cache_get_many(fingerprint, hashes) if use_cache else [None] * len(hashes)
+        )
+        misses = [index for index, result in enumerate(parsed) if result is None]
+        missed = set(misses)
+
+        if misses:
+            ocr = cls.get_ocr_engine()
+            batch = [_decode_image_input(inputs[index][1], images[index]) for index in misses]
+            with cls._inference_lock:
+                results = ocr.ocr(batch) or []
+            fresh: List[Tuple[str, Dict[str, Any]]] = []
+            for position, index in enumerate(misses):
+                ocr_result = results[position] if position < len(results) else None
+                result = cls._parse_ocr_result(ocr_result)
+                fresh.append((hashes[index], result))
+                parsed[index] = result
+            _cache_set_many(fingerprint, fresh)
+
+        return [
+            {**result, "content_hash": content_hash, "cached": index not in missed}
+            for index, (result, content_hash) in enumerate(zip(parsed, hashes))
+        ]
+
+    @classmethod
+    def iter_ocr_batches(
+        cls,
+        images: Sequence[ImageInput],
+        *,
+        batch_size: int = 1,
+        workers: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield run_ocr_batch() results for consecutive slices of ``images``, in order.
+
+        Batches are processed by a small thread pool so that reading, decoding
+        and parsing one batch overlap with inference on the next.
+
+        Environment Variables:
+            OCR_THREADS: Default thread count (default: 2)
+        """
+        batch_size = max(1, batch_size)
+        batches = [list(images[start:start + batch_size]) for start in range(0, len(images), batch_size)]
+        if not batches:
+            return
+        if workers is None:
+            workers = int(os.getenv("OCR_THREADS", "2"))
+        workers = max(1, min(workers, len(batches)))
+        run_batch = partial(cls.run_ocr_batch, use_cache=use_cache)
+        if workers == 1:
+            for batch in batches:
+                yield run_batch(batch)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr") as executor:
+            yield from executor.map(run_batch, batches)
+
+    @classmethod
+    def _parse_ocr_result(cls, ocr_result: Any) -> Dict[str, Any]:
         # Parse results - PaddleOCR 3.x returns OCRResult objects
         detections: List[Dict[str, Any]] = []
         metadata: Dict[str, Any] = {}
 
-        if result:
-            ocr_result = result[0]
-
+        if ocr_result is not None:
             # Get JSON data from OCRResult object
             result_data = ocr_result.json
 
@@ -134,23 +430,32 @@ class OCRService:
                         and isinstance(texts, list)
                         and isinstance(scores, list)
                     ):
-                        print(f"✓ OCR detected {len(texts)} text regions")
-
-                        for i, (box, text, score) in enumerate(zip(boxes, texts, scores)):
+                        logger.debug("OCR detected %d text regions", len(texts))
+
+                        # Convert the polygon and score columns in one pass instead of
+                        # casting every coordinate individually.
+                        polys = _stack_points(boxes)
+                        if polys is None:
+                            polys = boxes
+                        score_values = np.asarray(scores, dtype=np.float64).tolist()
+
+                        # Other list-based fields are attached per index for reference;
+                        # resolve which columns qualify once rather than per detection.
+                        extra_columns = [
+                            (key, values, len(values))
+                            for key, values in res_data.items()
+                            if isinstance(values, list) and key not in _PRIMARY_RESULT_KEYS
+                        ]
+
+                        for i, (box, text, score) in enumerate(zip(polys, texts, score_values)):
                             detection: Dict[str, Any] = {
                                 "box": box,
                                 "text": text,
-                                "confidence": float(score),
+                                "confidence": score,
                                 "orientation": orientations[i] if i < len(orientations) else -1
                             }
 
-                            # Attach any other list-based fields for this index for reference
-                            extras: Dict[str, Any] = {}
-                            for key, values in res_data.items():
-                                if key in {"rec_polys", "rec_texts", "rec_scores"}:
-                                    continue
-                                if isinstance(values, list) and len(values) > i:
-                                    extras[key] = values[i]
+                            extras = {key: values[i] for key, values, size in extra_columns if i < size}
                             if extras:
                                 detection["extras"] = extras
 
@@ -177,21 +482,15 @@ class OCRService:
         """
         shapes: List[Dict[str, Any]] = []
 
-        for detection in detections:
-            points = detection.get("points")
-            if not isinstance(points, list):
-                continue
+        # Fast path: when every detection carries a well-formed polygon of the same
+        # size, validate and cast all of them with a single array conversion.
+        stacked = _stack_points([detection.get("points") for detection in detections])
 
-            # 正規化座標格式
-            normalized_points: List[List[float]] = []
-            for point in points:
-                if (
-                    isinstance(point, (list, tuple))
-                    and len(point) >= 2
-                    and isinstance(point[0], (int, float))
-                    and isinstance(point[1], (int, float))
-                ):
-                    normalized_points.append([float(point[0]), float(point[1])])
+        for index, detection in enumerate(detections):
+            if stacked is not None:
+                normalized_points = stacked[index]
+            else:
+                normalized_points = _normalize_points(detection.get("points"))
 
             if not normalized_points:
                 continue
@@ -1,13 +1,43 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence
+
 from django.conf import settings
-from redis import Redis
+from redis import ConnectionPool, Redis
 from rq import Queue
+from rq.job import Job as RQJob
+
+from .serializers import MsgpackSerializer
+
+
+REDIS_MAX_CONNECTIONS = 32
+
+
+@lru_cache(maxsize=1)
+def _connection_pool() -> ConnectionPool:
+    return ConnectionPool.from_url(settings.REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS)
 
 
 def get_connection() -> Redis:
-    return Redis.from_url(settings.REDIS_URL)
+    # Clients are cheap; sockets are shared through the process-wide pool.
+    return Redis(connection_pool=_connection_pool())
 
 
+@lru_cache(maxsize=4)
 def get_queue(name: str = "ocr") -> Queue:
-    return Queue(name, connection=get_connection())
+    return Queue(name, connection=get_connection(), serializer=MsgpackSerializer)
+
+
+def enqueue_many(
+    func: Callable[..., Any],
+    args_list: Sequence[Sequence[Any]],
+    *,
+    queue: Optional[Queue] = None,
+) -> List[RQJob]:
+    """Enqueue one call per argument tuple using a single Redis pipeline."""
+    if not args_list:
+        return []
+    queue = queue or get_queue()
+    job_datas = [Queue.prepare_data(func, args=tuple(args)) for args in args_list]
+    return queue.enqueue_many(job_datas)
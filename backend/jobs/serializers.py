@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any
+
+import msgpack
+
+
+class MsgpackSerializer:
+    """
+    RQ serializer that stores job arguments and results as msgpack.
+
+    OCR job payloads are plain dicts/lists of strings and numbers, which msgpack
+    encodes more compactly and faster than pickle. Workers must be started with
+    ``--serializer jobs.serializers.MsgpackSerializer`` to read these jobs.
+    """
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
@@ -1,15 +1,43 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
+import orjson
 from django.db import transaction
 from django.utils import timezone
+from redis import RedisError
 
 from .models import Job
+from .queue import get_connection
+
+# Live progress lives in Redis while a job runs; the DB only records state transitions.
+PROGRESS_KEY_TEMPLATE = "job:{job_id}:progress"
+PROGRESS_TTL_SECONDS = 24 * 3600
+
+
+LIST_JOB_FIELDS = (
+    "id",
+    "job_type",
+    "status",
+    "progress",
+    "record_slug",
+    "record_title",
+    "workspace_slug",
+    "created_by",
+    "created_at",
+    "updated_at",
+    "started_at",
+    "finished_at",
+    "rq_job_id",
+    "error_message",
+    "page_count",
+    "retry_count",
+    "source_path",
+)
 
 
 def serialize_job(job: Job) -> dict:
-    return {
+    data = {
         "id": str(job.id),
         "job_type": job.job_type,
         "status": job.status,
@@ -24,7 +52,40 @@ def serialize_job(job: Job) -> dict:
         "finished_at": job.finished_at.isoformat() if job.finished_at else None,
         "rq_job_id": job.rq_job_id or None,
         "error": job.error_message or None,
-        "payload": job.payload or {},
+        "page_count": job.page_count,
+        "retry_count": job.retry_count,
+        "source_path": job.source_path or None,
+    }
+    # Listing queries defer the payload column; touching it would cost one query per row.
+    if "payload" not in job.get_deferred_fields():
+        data["payload"] = job.payload or {}
+    return data
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def serialize_job_row(row: dict) -> dict:
+    """Serialize a ``Job.objects.values(*LIST_JOB_FIELDS)`` row without a model instance."""
+    return {
+        "id": str(row["id"]),
+        "job_type": row["job_type"],
+        "status": row["status"],
+        "progress": row["progress"],
+        "record_slug": row["record_slug"],
+        "record_title": row["record_title"],
+        "workspace": row["workspace_slug"],
+        "created_by": row["created_by"],
+        "created_at": _isoformat(row["created_at"]),
+        "updated_at": _isoformat(row["updated_at"]),
+        "started_at": _isoformat(row["started_at"]),
+        "finished_at": _isoformat(row["finished_at"]),
+        "rq_job_id": row["rq_job_id"] or None,
+        "error": row["error_message"] or None,
+        "page_count": row["page_count"],
+        "retry_count": row["retry_count"],
+        "source_path": row["source_path"] or None,
     }
 
 
@@ -35,6 +96,7 @@ def create_job(
     record_title: str,
     job_type: str = "ocr",
     created_by: Optional[str] = None,
+    source_path: str = "",
     payload: Optional[dict] = None,
 ) -> Job:
     with transaction.atomic():
@@ -44,13 +106,61 @@ def create_job(
             record_title=record_title,
             job_type=job_type,
             created_by=created_by or "",
+            source_path=source_path,
             payload=payload or {},
         )
     return job
 
 
-def list_jobs(*, status: Optional[str] = None, limit: Optional[int] = None) -> List[Job]:
-    queryset = Job.objects.all()
+def create_jobs(
+    *,
+    workspace_slug: str,
+    records: Iterable[tuple[str, str]],
+    job_type: str = "ocr",
+    created_by: Optional[str] = None,
+) -> List[Job]:
+    """Create one job per ``(record_slug, record_title)`` pair with a single INSERT."""
+    jobs = [
+        Job(
+            workspace_slug=workspace_slug,
+            record_slug=record_slug,
+            record_title=record_title,
+            job_type=job_type,
+            created_by=created_by or "",
+            source_path=f"records/{record_slug}",
+            payload={},
+        )
+        for record_slug, record_title in records
+    ]
+    with transaction.atomic():
+        return Job.objects.bulk_create(jobs)
+
+
+def set_rq_job_ids(jobs: List[Job], rq_job_ids: List[str]) -> None:
+    now = timezone.now()
+    for job, rq_job_id in zip(jobs, rq_job_ids):
+        job.rq_job_id = rq_job_id
+        job.updated_at = now
+    Job.objects.bulk_update(jobs, ["rq_job_id", "updated_at"])
+
+
+def list_jobs(
+    *,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    with_payload: bool = False,
+) -> List[Job]:
+    queryset = Job.objects.all() if with_payload else Job.objects.only(*LIST_JOB_FIELDS)
+    if status:
+        queryset = queryset.filter(status=status)
+    if limit:
+        queryset = queryset[: limit]
+    return list(queryset)
+
+
+def list_job_rows(*, status: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+    """Like list_jobs, but returns plain value dicts for the listing endpoint."""
+    queryset = Job.objects.values(*LIST_JOB_FIELDS)
     if status:
         queryset = queryset.filter(status=status)
     if limit:
@@ -63,20 +173,113 @@ def get_job(job_id: str) -> Job:
 
 
 def update_job_progress(job: Job, *, progress: int):
+    # A single UPDATE without re-saving the row; auto_now is applied by hand.
+    job.progress = max(0, min(progress, 100))
+    job.updated_at = timezone.now()
+    Job.objects.filter(pk=job.pk).update(progress=job.progress, updated_at=job.updated_at)
+
+
+def publish_job_progress(job: Job, *, progress: int) -> None:
+    """
+    Record in-flight progress in Redis and broadcast it on the job's channel.
+
+    Subscribers listen on ``job:<id>:progress``; the stored key lets polling
+    endpoints overlay the live value. Falls back to a DB write if Redis is down.
+    """
     job.progress = max(0, min(progress, 100))
-    job.save(update_fields=["progress", "updated_at"])
+    key = PROGRESS_KEY_TEMPLATE.format(job_id=job.pk)
+    try:
+        pipe = get_connection().pipeline(transaction=False)
+        pipe.set(key, job.progress, ex=PROGRESS_TTL_SECONDS)
+        pipe.publish(key, orjson.dumps({"id": str(job.pk), "progress": job.progress}))
+        pipe.execute()
+    except RedisError:
+        update_job_progress(job, progress=job.progress)
+
+
+def apply_live_progress(payloads: List[Dict]) -> List[Dict]:
+    """Overlay Redis progress onto serialized running jobs with a single MGET."""
+    running = [payload for payload in payloads if payload.get("status") == Job.Status.RUNNING]
+    if not running:
+        return payloads
+    keys = [PROGRESS_KEY_TEMPLATE.format(job_id=payload["id"]) for payload in running]
+    try:
+        values = get_connection().mget(keys)
+    except RedisError:
+        return payloads
+    for payload, value in zip(running, values):
+        if value is not None:
+            # The key is cleared on every transition, so whatever is stored belongs to this run.
+            payload["progress"] = int(value)
+    return payloads
+
+
+def clear_job_progress(job: Job) -> None:
+    """Drop the live progress key so a previous run's value never overlays the current one."""
+    try:
+        get_connection().delete(PROGRESS_KEY_TEMPLATE.format(job_id=job.pk))
+    except RedisError:
+        pass
+
+
+TERMINAL_STATUSES = frozenset({Job.Status.FINISHED, Job.Status.FAILED, Job.Status.CANCELED})
+
+
+def _apply_transition(job: Job, transition: Callable[[Job], None], update_fields: List[str]) -> Job:
+    """
+    Apply a state change to the locked row so concurrent transitions serialize.
+
+    A row that is already finished, failed or canceled is left as it is: a cancel racing a
+    finish, or a late failure, must not overwrite the first terminal state. ``job`` is synced
+    to the stored row either way.
+    """
+    with transaction.atomic():
+        locked = Job.objects.select_for_update().get(pk=job.pk)
+        if locked.status not in TERMINAL_STATUSES:
+            transition(locked)
+            locked.save(update_fields=update_fields)
+    for field in ("status", *update_fields):
+        setattr(job, field, getattr(locked, field))
+    return job
 
 
 def mark_job_running(job: Job):
-    job.mark_running()
-    job.save(update_fields=["status", "started_at", "updated_at"])
+    _apply_transition(job, Job.mark_running, ["status", "started_at", "updated_at"])
+    clear_job_progress(job)
 
 
-def mark_job_finished(job: Job):
-    job.mark_finished()
-    job.save(update_fields=["status", "progress", "finished_at", "updated_at"])
+def mark_job_finished(
+    job: Job,
+    *,
+    payload: Optional[dict] = None,
+    page_count: Optional[int] = None,
+):
+    update_fields = ["status", "progress", "finished_at", "updated_at"]
+    if page_count is not None:
+        update_fields.append("page_count")
+    if payload is not None:
+        update_fields.append("payload")
+
+    def transition(locked: Job):
+        locked.mark_finished()
+        if page_count is not None:
+            locked.page_count = page_count
+        if payload is not None:
+            locked.payload = payload
+
+    _apply_transition(job, transition, update_fields)
+    clear_job_progress(job)
 
 
 def mark_job_failed(job: Job, *, message: Optional[str] = None):
-    job.mark_failed(message)
-    job.save(update_fields=["status", "error_message", "finished_at", "updated_at"])
+    _apply_transition(
+        job,
+        lambda locked: locked.mark_failed(message),
+        ["status", "error_message", "finished_at", "updated_at"],
+    )
+    clear_job_progress(job)
+
+
+def mark_job_canceled(job: Job):
+    _apply_transition(job, Job.mark_canceled, ["status", "finished_at", "updated_at"])
+    clear_job_progress(job)
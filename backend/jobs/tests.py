@@ -0,0 +1,635 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+import orjson
+from django.test import SimpleTestCase, TestCase
+from PIL import Image
+from redis import Redis, RedisError
+from rq.job import Job as RQJob
+
+from records import services as record_services
+
+from . import ocr_service
+from . import services as job_services
+from . import tasks
+from .models import Job
+from .ocr_service import OCRService
+from .queue import enqueue_many
+from .serializers import MsgpackSerializer
+from .services import (
+    apply_live_progress,
+    create_job,
+    create_jobs,
+    list_job_rows,
+    list_jobs,
+    mark_job_canceled,
+    mark_job_failed,
+    mark_job_finished,
+    mark_job_running,
+    publish_job_progress,
+    serialize_job,
+    serialize_job_row,
+    set_rq_job_ids,
+)
+
+
+class ListJobsTests(TestCase):
+    def setUp(self):
+        for index in range(3):
+            create_job(
+                workspace_slug="demo",
+                record_slug=f"record-{index}",
+                record_title=f"Record {index}",
+                payload={"pages": index},
+            )
+
+    def test_list_jobs_serializes_without_per_row_queries(self):
+        with self.assertNumQueries(1):
+            jobs = list_jobs()
+            payloads = [serialize_job(job) for job in jobs]
+
+        self.assertEqual(len(payloads), 3)
+        self.assertTrue(all("payload" not in payload for payload in payloads))
+
+    def test_list_jobs_with_payload_includes_payload(self):
+        jobs = list_jobs(status=Job.Status.PENDING, with_payload=True)
+
+        payloads = [serialize_job(job) for job in jobs]
+        self.assertEqual(sorted(payload["payload"]["pages"] for payload in payloads), [0, 1, 2])
+
+    def test_list_job_rows_match_model_serialization(self):
+        with self.assertNumQueries(1):
+            rows = [serialize_job_row(row) for row in list_job_rows()]
+
+        self.assertEqual(rows, [serialize_job(job) for job in list_jobs()])
+
+
+class JobTransitionTests(TestCase):
+    def setUp(self):
+        self.job = create_job(workspace_slug="demo", record_slug="record", record_title="Record")
+
+    def test_cancel_after_finish_keeps_finished(self):
+        mark_job_finished(self.job, page_count=3)
+        stale = Job.objects.get(pk=self.job.pk)
+
+        mark_job_canceled(stale)
+
+        stored = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(stored.status, Job.Status.FINISHED)
+        self.assertEqual(stored.progress, 100)
+        self.assertEqual(stale.status, Job.Status.FINISHED)
+
+    def test_late_failure_does_not_overwrite_cancel(self):
+        mark_job_canceled(self.job)
+
+        mark_job_failed(self.job, message="boom")
+
+        stored = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(stored.status, Job.Status.CANCELED)
+        self.assertEqual(stored.error_message, "")
+
+
+class _FakeOCRResult:
+    def __init__(self, text):
+        self.json = {
+            "res": {
+                "rec_polys": [[[0, 0], [4, 0], [4, 2], [0, 2]]],
+                "rec_texts": [text],
+                "rec_scores": [0.9],
+            }
+        }
+
+
+class _FakeOCREngine:
+    def __init__(self):
+        self.batches = []
+
+    def ocr(self, batch):
+        self.batches.append(len(batch))
+        return [_FakeOCRResult(f"text-{len(self.batches)}-{index}") for index in range(len(batch))]
+
+
+class _FakePipeline:
+    def __init__(self, connection):
+        self.connection = connection
+        self.pending = []
+
+    def setex(self, key, ttl, value):
+        self.pending.append((key, value))
+
+    def set(self, key, value, ex=None):
+        self.pending.append((key, value))
+
+    def publish(self, channel, message):
+        self.connection.published.append((channel, message))
+
+    def execute(self):
+        self.connection.pipelines += 1
+        self.connection.store.update(self.pending)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.published = []
+        self.mget_calls = 0
+        self.pipelines = 0
+
+    def mget(self, keys):
+        self.mget_calls += 1
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+class OCRResultCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        self.engine = _FakeOCREngine()
+        self.images = [np.full((2, 2, 3), value, dtype=np.uint8) for value in range(3)]
+        self._old_get_connection = ocr_service.get_connection
+        self._old_get_engine = OCRService.__dict__["get_ocr_engine"]
+        ocr_service.get_connection = lambda: self.redis
+        OCRService.get_ocr_engine = classmethod(lambda cls: self.engine)
+
+    def tearDown(self):
+        ocr_service.get_connection = self._old_get_connection
+        OCRService.get_ocr_engine = self._old_get_engine
+
+    def test_batch_reads_and_writes_the_cache_in_one_round_trip_each(self):
+        first = OCRService.run_ocr_batch(self.images)
+        second = OCRService.run_ocr_batch(self.images)
+
+        self.assertEqual(self.engine.batches, [3])
+        self.assertEqual(self.redis.mget_calls, 2)
+        self.assertEqual(self.redis.pipelines, 1)
+        self.assertEqual([result["cached"] for result in first], [False, False, False])
+        self.assertEqual([result["cached"] for result in second], [True, True, True])
+        self.assertEqual(
+            [result["detections"] for result in second],
+            [result["detections"] for result in first],
+        )
+
+    def test_refresh_skips_lookup_and_replaces_cached_results(self):
+        OCRService.run_ocr_batch(self.images)
+
+        refreshed = OCRService.run_ocr_batch(self.images, use_cache=False)
+        cached = OCRService.run_ocr_batch(self.images)
+
+        self.assertEqual(self.engine.batches, [3, 3])
+        self.assertEqual(self.redis.mget_calls, 2)
+        self.assertEqual([result["cached"] for result in refreshed], [False, False, False])
+        self.assertEqual(cached[0]["detections"][0]["text"], "text-2-0")
+
+    def test_model_settings_are_part_of_the_cache_key(self):
+        OCRService.run_ocr_batch(self.images)
+
+        with mock.patch.dict(os.environ, {"OCR_REC_MODEL": "another-rec-model"}):
+            results = OCRService.run_ocr_batch(self.images)
+
+        self.assertEqual(self.engine.batches, [3, 3])
+        self.assertEqual([result["cached"] for result in results], [False, False, False])
+
+
+class MsgpackSerializerTests(SimpleTestCase):
+    def test_rq_job_arguments_round_trip(self):
+        connection = Redis()
+        job = RQJob.create(
+            "jobs.tasks.run_record_ocr_job",
+            args=("job-id", "demo", "第一冊", True),
+            connection=connection,
+            serializer=MsgpackSerializer,
+        )
+
+        restored = RQJob(job.id, connection=connection, serializer=MsgpackSerializer)
+        restored.data = job.data
+
+        self.assertEqual(restored.func_name, "jobs.tasks.run_record_ocr_job")
+        self.assertEqual(list(restored.args), ["job-id", "demo", "第一冊", True])
+        self.assertEqual(restored.kwargs, {})
+
+    def test_job_payload_round_trips(self):
+        payload = {"record": "第一冊", "pages": 3, "content_hashes": {"001.png": "ab"}, "ratio": 0.5}
+
+        self.assertEqual(MsgpackSerializer.loads(MsgpackSerializer.dumps(payload)), payload)
+
+
+class _FakeRQJob:
+    def __init__(self, job_id):
+        self.id = job_id
+
+
+class _FakeQueue:
+    def __init__(self):
+        self.calls = []
+
+    def enqueue_many(self, job_datas):
+        self.calls.append(job_datas)
+        return [_FakeRQJob(f"rq-{index}") for index in range(len(job_datas))]
+
+
+class BulkEnqueueTests(TestCase):
+    def test_jobs_are_created_and_enqueued_in_one_call(self):
+        queue = _FakeQueue()
+
+        jobs = create_jobs(
+            workspace_slug="demo",
+            records=[("第一冊", "第一冊"), ("第二冊", "第二冊")],
+            created_by="tester",
+        )
+        rq_jobs = enqueue_many(
+            print,
+            [(str(job.id), "demo", job.record_slug, False) for job in jobs],
+            queue=queue,
+        )
+        set_rq_job_ids(jobs, [rq_job.id for rq_job in rq_jobs])
+
+        self.assertEqual(len(queue.calls), 1)
+        self.assertEqual(
+            [data.args for data in queue.calls[0]],
+            [(str(job.id), "demo", job.record_slug, False) for job in jobs],
+        )
+        stored = {job.record_slug: job for job in Job.objects.all()}
+        self.assertEqual(stored["第一冊"].rq_job_id, "rq-0")
+        self.assertEqual(stored["第二冊"].rq_job_id, "rq-1")
+        self.assertEqual(stored["第二冊"].source_path, "records/第二冊")
+        self.assertEqual(stored["第二冊"].created_by, "tester")
+
+    def test_enqueue_many_without_arguments_skips_the_queue(self):
+        queue = _FakeQueue()
+
+        self.assertEqual(enqueue_many(print, [], queue=queue), [])
+        self.assertEqual(queue.calls, [])
+
+
+class _DownRedis:
+    def pipeline(self, transaction=True):
+        raise RedisError("down")
+
+    def mget(self, keys):
+        raise RedisError("down")
+
+    def delete(self, key):
+        raise RedisError("down")
+
+
+class LiveProgressTests(TestCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        self._old_get_connection = job_services.get_connection
+        job_services.get_connection = lambda: self.redis
+        self.job = create_job(workspace_slug="demo", record_slug="record", record_title="Record")
+        mark_job_running(self.job)
+
+    def tearDown(self):
+        job_services.get_connection = self._old_get_connection
+
+    def test_progress_is_published_without_touching_the_row(self):
+        publish_job_progress(self.job, progress=40)
+
+        key = f"job:{self.job.pk}:progress"
+        message = orjson.dumps({"id": str(self.job.pk), "progress": 40})
+        self.assertEqual(self.redis.published, [(key, message)])
+        self.assertEqual(Job.objects.get(pk=self.job.pk).progress, 0)
+
+        idle = create_job(workspace_slug="demo", record_slug="idle", record_title="Idle")
+        payloads = apply_live_progress([serialize_job(self.job), serialize_job(idle)])
+        self.assertEqual([payload["progress"] for payload in payloads], [40, 0])
+        self.assertEqual(self.redis.mget_calls, 1)
+
+    def test_transition_clears_the_live_value(self):
+        publish_job_progress(self.job, progress=40)
+        mark_job_finished(self.job, page_count=1)
+
+        self.assertEqual(self.redis.store, {})
+        payload = apply_live_progress([serialize_job(Job.objects.get(pk=self.job.pk))])[0]
+        self.assertEqual(payload["progress"], 100)
+
+    def test_throttle_publishes_only_meaningful_steps(self):
+        throttle = tasks._ProgressThrottle(self.job)
+
+        for progress in (1, 2, 6, 7, 8):
+            throttle.report(progress)
+        throttle.report(8, force=True)
+
+        published = [orjson.loads(message)["progress"] for _channel, message in self.redis.published]
+        self.assertEqual(published, [6, 8])
+
+    def test_progress_falls_back_to_the_database_when_redis_is_down(self):
+        job_services.get_connection = lambda: _DownRedis()
+
+        publish_job_progress(self.job, progress=40)
+
+        self.assertEqual(Job.objects.get(pk=self.job.pk).progress, 40)
+        payload = apply_live_progress([serialize_job(self.job)])[0]
+        self.assertEqual(payload["progress"], 40)
+
+
+class _JsonResult:
+    def __init__(self, res):
+        self.json = {"res": res}
+
+
+class OCRResultParsingTests(SimpleTestCase):
+    def test_polygons_and_scores_are_cast_to_floats(self):
+        parsed = OCRService._parse_ocr_result(
+            _JsonResult(
+                {
+                    "rec_polys": [[[0, 0], [4, 0], [4, 2], [0, 2]], [[1, 1], [5, 1], [5, 3], [1, 3]]],
+                    "rec_texts": ["甲", "乙"],
+                    "rec_scores": [1, 0.5],
+                }
+            )
+        )
+
+        first, second = parsed["detections"]
+        self.assertEqual(first["points"], [[0.0, 0.0], [4.0, 0.0], [4.0, 2.0], [0.0, 2.0]])
+        self.assertIsInstance(first["points"][0][0], float)
+        self.assertIsInstance(first["confidence"], float)
+        self.assertEqual(second["text"], "乙")
+        self.assertEqual(second["orientation"], -1)
+
+    def test_stack_points_rejects_ragged_or_non_numeric_polygons(self):
+        self.assertIsNone(ocr_service._stack_points([[[0, 0], [1, 0], [1, 1]], [[0, 0], [1, 1]]]))
+        self.assertIsNone(ocr_service._stack_points([[["a", "b"], ["c", "d"]]]))
+        self.assertIsNone(ocr_service._stack_points([]))
+        self.assertEqual(ocr_service._stack_points([[[1, 2], [3, 4]]]), [[[1.0, 2.0], [3.0, 4.0]]])
+
+    def test_label_format_validates_ragged_polygons_point_by_point(self):
+        label = OCRService.format_for_label(
+            [
+                {"text": "甲", "points": [[0, 0], [4, 0], [4, 2]], "confidence": 0.9},
+                {"text": "乙", "points": [[0, 0], ["x", 1], [5, 1], [5, 3]], "confidence": 0.8},
+                {"text": "丙", "points": None},
+            ]
+        )
+
+        self.assertEqual(
+            [(shape["text"], shape["points"]) for shape in label["shapes"]],
+            [
+                ("甲", [[0.0, 0.0], [4.0, 0.0], [4.0, 2.0]]),
+                ("乙", [[0.0, 0.0], [5.0, 1.0], [5.0, 3.0]]),
+            ],
+        )
+
+    def test_extra_columns_are_attached_per_detection(self):
+        parsed = OCRService._parse_ocr_result(
+            _JsonResult(
+                {
+                    "rec_polys": [[[0, 0], [4, 0], [4, 2], [0, 2]], [[1, 1], [5, 1], [5, 3], [1, 3]]],
+                    "rec_texts": ["甲", "乙"],
+                    "rec_scores": [0.9, 0.8],
+                    "rec_boxes": [[0, 0, 4, 2], [1, 1, 5, 3]],
+                    "dt_scores": [0.7],
+                    "model_settings": {"use_doc_preprocessor": False},
+                }
+            )
+        )
+
+        first, second = parsed["detections"]
+        self.assertEqual(first["extras"], {"rec_boxes": [0, 0, 4, 2], "dt_scores": 0.7})
+        self.assertEqual(second["extras"], {"rec_boxes": [1, 1, 5, 3]})
+
+
+class _EchoOCREngine:
+    """Reads each image's first pixel back as its text."""
+
+    def __init__(self):
+        self.batches = []
+
+    def ocr(self, batch):
+        self.batches.append(batch)
+        return [_FakeOCRResult(str(int(image[0, 0, 0]))) for image in batch]
+
+
+class OCRBatchTests(SimpleTestCase):
+    def setUp(self):
+        self.engine = _EchoOCREngine()
+        self.images = [np.full((2, 2, 3), value, dtype=np.uint8) for value in range(5)]
+        self._old_get_connection = ocr_service.get_connection
+        self._old_get_engine = OCRService.__dict__["get_ocr_engine"]
+        ocr_service.get_connection = lambda: _FakeRedis()
+        OCRService.get_ocr_engine = classmethod(lambda cls: self.engine)
+
+    def tearDown(self):
+        ocr_service.get_connection = self._old_get_connection
+        OCRService.get_ocr_engine = self._old_get_engine
+
+    def _texts(self, batches):
+        return [[result["detections"][0]["text"] for result in batch] for batch in batches]
+
+    def test_images_are_sent_to_the_engine_in_batches(self):
+        batches = list(OCRService.iter_ocr_batches(self.images, batch_size=2, workers=1))
+
+        self.assertEqual(self._texts(batches), [["0", "1"], ["2", "3"], ["4"]])
+        self.assertEqual([len(batch) for batch in self.engine.batches], [2, 2, 1])
+
+    def test_threaded_batches_come_back_in_order(self):
+        images = [np.full((2, 2, 3), value, dtype=np.uint8) for value in range(12)]
+
+        batches = list(OCRService.iter_ocr_batches(images, batch_size=2, workers=3))
+
+        self.assertEqual(
+            self._texts(batches),
+            [[str(value), str(value + 1)] for value in range(0, 12, 2)],
+        )
+        self.assertEqual(sorted(len(batch) for batch in self.engine.batches), [2] * 6)
+
+    def test_encoded_bytes_and_paths_reach_the_engine_decoded(self):
+        encoded = cv2.imencode(".png", np.full((3, 4, 3), 7, dtype=np.uint8))[1].tobytes()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            page_path = Path(tmp_dir) / "001.png"
+            page_path.write_bytes(encoded)
+
+            from_bytes, from_path = OCRService.run_ocr_batch([encoded, page_path])
+
+        decoded = self.engine.batches[0]
+        self.assertTrue(all(isinstance(image, np.ndarray) for image in decoded))
+        self.assertEqual([image.shape for image in decoded], [(3, 4, 3), (3, 4, 3)])
+        self.assertEqual(from_bytes["detections"][0]["text"], "7")
+        self.assertEqual(from_bytes["content_hash"], from_path["content_hash"])
+
+    def test_undecodable_bytes_are_rejected(self):
+        with self.assertRaises(ValueError):
+            OCRService.run_ocr(b"not an image")
+
+
+class _OrientationRecognizer:
+    """Reads a crop confidently only when its black marker pixel sits top-left."""
+
+    def __init__(self):
+        self.inputs = []
+
+    def predict(self, inputs, batch_size=1):
+        self.inputs.extend(inputs)
+        return [
+            {"res": {"rec_text": "read", "rec_score": 0.99}}
+            if not image[0, 0].any()
+            else {"res": {"rec_text": "weak", "rec_score": 0.1}}
+            for image in inputs
+        ]
+
+
+class ItemReOCRTests(TestCase):
+    upright_box = [[0, 0], [12, 0], [12, 6], [0, 6]]
+    upside_down_box = [[20, 0], [30, 0], [30, 6], [20, 6]]
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        workspaces_root = Path(self._tmp_dir.name)
+        pages_dir = workspaces_root / "demo" / "records" / "第一冊" / "pages"
+        pages_dir.mkdir(parents=True)
+        page = Image.new("RGB", (40, 20), (255, 255, 255))
+        page.putpixel((0, 0), (0, 0, 0))
+        page.putpixel((29, 5), (0, 0, 0))
+        page.save(pages_dir / "001.png")
+
+        self.recognizer = _OrientationRecognizer()
+        self._old_root = record_services.WORKSPACE_ROOT
+        self._old_get_connection = job_services.get_connection
+        self._old_get_recognizer = OCRService.__dict__["get_text_recognition_engine"]
+        record_services.WORKSPACE_ROOT = workspaces_root
+        job_services.get_connection = lambda: _FakeRedis()
+        OCRService.get_text_recognition_engine = classmethod(lambda cls: self.recognizer)
+        self.workspace = record_services.get_workspace("demo")
+
+    def tearDown(self):
+        record_services.WORKSPACE_ROOT = self._old_root
+        job_services.get_connection = self._old_get_connection
+        OCRService.get_text_recognition_engine = self._old_get_recognizer
+        self._tmp_dir.cleanup()
+
+    def _run(self, boxes):
+        shapes = [{"label": "text", "text": "", "points": points} for points in boxes]
+        record_services.save_annotations(self.workspace, "第一冊/001.png", {"shapes": shapes})
+        job = create_job(workspace_slug="demo", record_slug="第一冊", record_title="第一冊")
+        payload = tasks.run_item_reocr_job(str(job.pk), "demo", "第一冊/001.png")
+        annotations = record_services.load_annotations(self.workspace, "第一冊/001.png")
+        return payload, annotations["shapes"]
+
+    def test_upside_down_box_is_read_from_a_rotated_crop(self):
+        payload, shapes = self._run([self.upside_down_box])
+
+        self.assertEqual(payload["recognized_boxes"], 1)
+        self.assertEqual((shapes[0]["text"], shapes[0]["confidence"]), ("read", 0.99))
+        self.assertTrue(all(image.flags.c_contiguous for image in self.recognizer.inputs))
+
+    def test_rotation_sweep_stops_at_the_first_confident_read(self):
+        self._run([self.upside_down_box])
+
+        # Upright, then upside-down; the quarter turns are never tried.
+        self.assertEqual([image.shape[:2] for image in self.recognizer.inputs], [(6, 10), (6, 10)])
+
+    def test_confident_upright_box_is_not_rotated(self):
+        # Short of the sweep's early exit, only the upright threshold can skip a box.
+        with mock.patch.object(tasks, "REOCR_CONFIDENT_SCORE", 1.0):
+            payload, shapes = self._run([self.upright_box, self.upside_down_box])
+
+        self.assertEqual(payload["recognized_boxes"], 2)
+        self.assertEqual([shape["text"] for shape in shapes], ["read", "read"])
+        tried = [image.shape[:2] for image in self.recognizer.inputs]
+        self.assertEqual(tried.count((6, 12)), 1)
+        self.assertEqual(len(tried), 5)
+
+
+class ReOCRCropTests(SimpleTestCase):
+    def test_aspect_bucket_follows_the_rotated_shape(self):
+        wide = np.zeros((8, 32, 3), dtype=np.uint8)
+
+        self.assertEqual(tasks._aspect_bucket(wide, 0), 2)
+        self.assertEqual(tasks._aspect_bucket(wide, 2), 2)
+        self.assertEqual(tasks._aspect_bucket(wide, 1), -2)
+        self.assertEqual(tasks._aspect_bucket(np.zeros((1, 4096, 3), dtype=np.uint8), 0), 3)
+        self.assertEqual(tasks._aspect_bucket(np.zeros((4096, 1, 3), dtype=np.uint8), 0), -4)
+
+    def test_polygon_crop_whitens_pixels_outside_the_shape(self):
+        page = Image.new("RGB", (4, 4), (0, 0, 0))
+        triangle = np.asarray([[0, 0], [3, 0], [0, 3]], dtype=np.float32)
+        rectangle = np.asarray([[0, 0], [3, 0], [3, 3], [0, 3]], dtype=np.float32)
+
+        masked = tasks._crop_polygon(page, triangle, (0, 0, 4, 4))
+        plain = tasks._crop_polygon(page, rectangle, (0, 0, 4, 4))
+
+        self.assertEqual(masked.dtype, np.uint8)
+        self.assertEqual(masked[0, 0].tolist(), [0, 0, 0])
+        self.assertEqual(masked[3, 3].tolist(), [255, 255, 255])
+        self.assertFalse(plain.any())
+
+    def test_prepared_crops_arrive_in_order(self):
+        page = Image.new("RGB", (64, 8), (255, 255, 255))
+        entries = []
+        for index in range(20):
+            left = index * 2
+            points = np.asarray([[left, 0], [left + 2, 8]], dtype=np.float32)
+            entries.append((index, points, (left, 0, left + 2, 8)))
+
+        prepared = list(tasks._iter_prepared_crops(page, entries))
+
+        self.assertEqual([position for position, _crop in prepared], list(range(20)))
+        self.assertTrue(all(crop.shape == (8, 2, 3) for _position, crop in prepared))
+
+    def test_crop_failures_reach_the_consumer(self):
+        page = Image.new("RGB", (8, 8), (255, 255, 255))
+        entries = [(0, np.zeros((0, 2), dtype=np.float32), (0, 0, 4, 4)), (1, None, None)]
+
+        with self.assertRaises(TypeError):
+            list(tasks._iter_prepared_crops(page, entries))
+
+    def test_shape_points_and_bbox_are_clamped_to_the_page(self):
+        points = tasks._normalize_shape_points([[-2, 1.5], "bad", [5, None], [8.5, 9.75], [3, 4, 1]])
+
+        self.assertEqual(points.tolist(), [[-2.0, 1.5], [8.5, 9.75], [3.0, 4.0]])
+        self.assertEqual(tasks._compute_bbox(points, 8, 8), (0, 1, 8, 8))
+        self.assertIsNone(tasks._compute_bbox(points, 1, 8))
+        self.assertEqual(tasks._normalize_shape_points(None).shape, (0, 2))
+        self.assertIsNone(tasks._compute_bbox(tasks._normalize_shape_points([]), 8, 8))
+
+
+class RecordOCRJobTests(TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        workspaces_root = Path(self._tmp_dir.name)
+        pages_dir = workspaces_root / "demo" / "records" / "第一冊" / "pages"
+        pages_dir.mkdir(parents=True)
+        for value in range(1, 7):
+            Image.new("RGB", (4, 4), (value, value, value)).save(pages_dir / f"{value:03d}.png")
+
+        self.engine = _EchoOCREngine()
+        self._old_root = record_services.WORKSPACE_ROOT
+        self._old_job_connection = job_services.get_connection
+        self._old_cache_connection = ocr_service.get_connection
+        self._old_get_engine = OCRService.__dict__["get_ocr_engine"]
+        record_services.WORKSPACE_ROOT = workspaces_root
+        job_services.get_connection = lambda: _FakeRedis()
+        ocr_service.get_connection = lambda: _FakeRedis()
+        OCRService.get_ocr_engine = classmethod(lambda cls: self.engine)
+
+    def tearDown(self):
+        record_services.WORKSPACE_ROOT = self._old_root
+        job_services.get_connection = self._old_job_connection
+        ocr_service.get_connection = self._old_cache_connection
+        OCRService.get_ocr_engine = self._old_get_engine
+        self._tmp_dir.cleanup()
+
+    def test_every_page_gets_its_label_file(self):
+        job = create_job(workspace_slug="demo", record_slug="第一冊", record_title="第一冊")
+
+        payload = tasks.run_record_ocr_job(str(job.pk), "demo", "第一冊")
+
+        labels_dir = Path(self._tmp_dir.name) / "demo" / "labels" / "第一冊"
+        labels = {
+            path.name: orjson.loads(path.read_bytes())["shapes"][0]["text"]
+            for path in labels_dir.iterdir()
+        }
+        self.assertEqual(labels, {f"{value:03d}.json": str(value) for value in range(1, 7)})
+        self.assertEqual(payload["pages"], 6)
+        self.assertEqual(payload["total_detections"], 6)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.Status.FINISHED)
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from .views import item_reocr, job_cancel, job_detail, job_retry, jobs_clear, jobs_collection
+
+urlpatterns = [
+    # Jobs API
+    path('jobs', jobs_collection),
+    path('jobs/clear', jobs_clear),
+    path('jobs/<str:job_id>', job_detail),
+    path('jobs/<str:job_id>/retry', job_retry),
+    path('jobs/<str:job_id>/cancel', job_cancel),
+
+    # Item Re-OCR
+    path('items/<path:item_id>/reocr', item_reocr),
+]
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
-import json
 from typing import Optional
 
-from django.http import HttpResponseBadRequest, JsonResponse
-from django.utils import timezone
+import orjson
+from django.http import HttpResponse, HttpResponseBadRequest
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
 
+from config.responses import json_response
 from jobs.models import Job
-from jobs.queue import get_queue
-from jobs.services import create_job, get_job, list_jobs, serialize_job
+from jobs.queue import enqueue_many, get_queue
+from jobs.services import (
+    apply_live_progress,
+    clear_job_progress,
+    create_job,
+    create_jobs,
+    get_job,
+    list_job_rows,
+    mark_job_canceled,
+    serialize_job,
+    serialize_job_row,
+    set_rq_job_ids,
+)
 from jobs.tasks import run_record_ocr_job, run_item_reocr_job
 from records.services import RecordError, WorkspaceError, get_active_workspace, get_record, get_item
 
 
-def _json_error(message: str, *, status: int = 400) -> JsonResponse:
-    return JsonResponse({"ok": False, "error": message}, status=status)
+def _json_error(message: str, *, status: int = 400) -> HttpResponse:
+    return json_response({"ok": False, "error": message}, status=status)
 
 
 def _get_active_workspace_or_error() -> Optional[tuple]:
@@ -26,8 +37,13 @@ def _get_active_workspace_or_error() -> Optional[tuple]:
     return workspace
 
 
-def _job_payload(job: Job, *, status: int = 200) -> JsonResponse:
-    return JsonResponse({"ok": True, "job": serialize_job(job)}, status=status)
+def _job_payload(job: Job, *, status: int = 200) -> HttpResponse:
+    payload = apply_live_progress([serialize_job(job)])[0]
+    return json_response({"ok": True, "job": payload}, status=status)
+
+
+def _request_username(request) -> str:
+    return request.user.username if getattr(request, "user", None) and request.user.is_authenticated else ""
 
 
 @csrf_exempt
@@ -43,15 +59,21 @@ def jobs_collection(request):
             except ValueError:
                 return HttpResponseBadRequest("Invalid 'limit'.")
 
-        jobs = list_jobs(status=status_filter, limit=limit)
-        return JsonResponse({"ok": True, "jobs": [serialize_job(job) for job in jobs]})
+        rows = list_job_rows(status=status_filter, limit=limit)
+        jobs = apply_live_progress([serialize_job_row(row) for row in rows])
+        return json_response({"ok": True, "jobs": jobs})
 
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     job_type = payload.get("job_type") or "ocr"
+    # An explicit re-run asks for fresh model output instead of cached results.
+    refresh = payload.get("refresh") is True
+    if "records" in payload:
+        return _create_record_jobs(request, payload.get("records"), job_type=job_type, refresh=refresh)
+
     record_slug = payload.get("record") or payload.get("record_slug")
     if not record_slug:
         return HttpResponseBadRequest("Missing 'record' field.")
@@ -66,13 +88,14 @@ def jobs_collection(request):
     except RecordError as exc:
         return _json_error(str(exc), status=404)
 
-    created_by = request.user.username if getattr(request, "user", None) and request.user.is_authenticated else ""
+    created_by = _request_username(request)
     job = create_job(
         workspace_slug=workspace.slug,
         record_slug=record.slug,
         record_title=record.title,
         job_type=job_type,
         created_by=created_by,
+        source_path=f"records/{record.slug}",
     )
 
     queue = get_queue()
@@ -81,6 +104,7 @@ def jobs_collection(request):
         str(job.id),
         workspace.slug,
         record.slug,
+        refresh,
     )
     job.rq_job_id = rq_job.id
     job.save(update_fields=["rq_job_id", "updated_at"])
@@ -88,6 +112,40 @@ def jobs_collection(request):
     return _job_payload(job, status=201)
 
 
+def _create_record_jobs(request, record_slugs, *, job_type: str, refresh: bool = False) -> HttpResponse:
+    """Create and enqueue OCR jobs for several records with one INSERT and one Redis round-trip."""
+    if not isinstance(record_slugs, list) or not record_slugs:
+        return HttpResponseBadRequest("'records' must be a non-empty array.")
+    if not all(isinstance(slug, str) and slug.strip() for slug in record_slugs):
+        return HttpResponseBadRequest("Each item in 'records' must be a non-empty string.")
+
+    try:
+        workspace = _get_active_workspace_or_error()
+    except WorkspaceError as exc:
+        return _json_error(str(exc), status=400)
+
+    records = []
+    for slug in dict.fromkeys(slug.strip() for slug in record_slugs):
+        try:
+            records.append(get_record(workspace, slug))
+        except RecordError as exc:
+            return _json_error(str(exc), status=404)
+
+    jobs = create_jobs(
+        workspace_slug=workspace.slug,
+        records=[(record.slug, record.title) for record in records],
+        job_type=job_type,
+        created_by=_request_username(request),
+    )
+    rq_jobs = enqueue_many(
+        run_record_ocr_job,
+        [(str(job.id), workspace.slug, job.record_slug, refresh) for job in jobs],
+    )
+    set_rq_job_ids(jobs, [rq_job.id for rq_job in rq_jobs])
+
+    return json_response({"ok": True, "jobs": [serialize_job(job) for job in jobs]}, status=201)
+
+
 @require_GET
 def job_detail(request, job_id: str):
     try:
@@ -108,12 +166,17 @@ def job_retry(request, job_id: str):
     if job.status not in (Job.Status.FAILED, Job.Status.CANCELED, Job.Status.FINISHED):
         return _json_error("Job is still in progress.", status=400)
 
+    # Re-running a finished job is a request for fresh results; failed or canceled runs
+    # may reuse the pages that were already recognized.
+    refresh = job.status == Job.Status.FINISHED
     job.status = Job.Status.PENDING
     job.error_message = ""
     job.progress = 0
     job.started_at = None
     job.finished_at = None
-    job.save(update_fields=["status", "error_message", "progress", "started_at", "finished_at", "updated_at"])
+    job.retry_count += 1
+    job.save(update_fields=["status", "error_message", "progress", "started_at", "finished_at", "retry_count", "updated_at"])
+    clear_job_progress(job)
 
     queue = get_queue()
     rq_job = queue.enqueue(
@@ -121,6 +184,7 @@ def job_retry(request, job_id: str):
         str(job.id),
         job.workspace_slug,
         job.record_slug,
+        refresh,
     )
     job.rq_job_id = rq_job.id
     job.save(update_fields=["rq_job_id", "updated_at"])
@@ -145,9 +209,7 @@ def job_cancel(request, job_id: str):
         if rq_job and rq_job.get_status(refresh=False) in {"queued", "deferred"}:
             rq_job.cancel()
 
-    job.status = Job.Status.CANCELED
-    job.finished_at = timezone.now()
-    job.save(update_fields=["status", "finished_at", "updated_at"])
+    mark_job_canceled(job)
     return _job_payload(job)
 
 
@@ -156,8 +218,8 @@ def job_cancel(request, job_id: str):
 def jobs_clear(request):
     """Clear all finished, failed, and canceled jobs"""
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     # Get status filter from payload (default to finished/failed/canceled)
@@ -166,7 +228,7 @@ def jobs_clear(request):
     # Delete jobs with specified statuses
     deleted_count = Job.objects.filter(status__in=status_list).delete()[0]
 
-    return JsonResponse({
+    return json_response({
         "ok": True,
         "deleted_count": deleted_count,
         "message": f"已刪除 {deleted_count} 個工作記錄"
@@ -189,13 +251,14 @@ def item_reocr(request, item_id: str):
         return _json_error(f"找不到頁面: {str(exc)}", status=404)
 
     # Create job
-    created_by = request.user.username if getattr(request, "user", None) and request.user.is_authenticated else ""
+    created_by = _request_username(request)
     job = create_job(
         workspace_slug=workspace.slug,
         record_slug=item.record,
         record_title=f"{item.record} - 重新辨識",
         job_type="reocr",
         created_by=created_by,
+        source_path=item.rel_path.as_posix(),
     )
 
     # Enqueue task
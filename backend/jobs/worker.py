@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import logging
+import os
+
+import django
+import numpy as np
+from rq import SimpleWorker
+
+logger = logging.getLogger("ocr.startup")
+
+# Blank page large enough to run detection/recognition end to end
+WARMUP_IMAGE_SHAPE = (32, 32, 3)
+
+
+def warm_ocr_engine() -> None:
+    """Load the PaddleOCR engine and run one dummy inference."""
+    from jobs.ocr_service import OCRService
+
+    engine = OCRService.get_ocr_engine()
+    engine.ocr(np.full(WARMUP_IMAGE_SHAPE, 255, dtype=np.uint8))
+
+
+class PrewarmWorker(SimpleWorker):
+    """
+    RQ worker that initializes PaddleOCR before it starts dequeuing jobs.
+
+    Jobs run in the worker process itself (no fork per job), so the warmed
+    engine is reused by every job instead of being rebuilt in each work horse.
+    The trade-off is isolation: a crash inside Paddle ends the worker, so the
+    compose files restart it.
+
+    Start with ``rq worker -w jobs.worker.PrewarmWorker ocr``. Set
+    ``OCR_WARMUP=0`` to skip the warm-up.
+    """
+
+    def work(self, *args, **kwargs):
+        # Settings LOGGING routes the ocr.startup INFO lines; configure it before warming.
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+        django.setup()
+        if os.getenv("OCR_WARMUP", "1").lower() not in ("0", "false", "no"):
+            try:
+                warm_ocr_engine()
+            except Exception:  # pylint: disable=broad-except
+                # A failed warm-up only costs latency; the first job retries the init.
+                logger.exception("PaddleOCR warm-up failed")
+        return super().work(*args, **kwargs)
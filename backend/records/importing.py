@@ -1,17 +1,25 @@
 from __future__ import annotations
 
-import json
+import os
 import re
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path, PurePosixPath
 from typing import Any, Iterable, Mapping, Tuple
 
+import orjson
+
 
 SUPPORTED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff"}
 IGNORED_FILE_NAMES = {".DS_Store", "Thumbs.db"}
 IGNORED_DIRECTORY_NAMES = {"__MACOSX", ".git", ".svn"}
 _NATURAL_SORT_RE = re.compile(r"(\d+)")
+COMMIT_PARALLEL_MIN = 8
+COMMIT_WORKERS = min(8, os.cpu_count() or 1)
+_EMPTY_SIDECAR_BYTES = orjson.dumps({"annotations": []}, option=orjson.OPT_INDENT_2)
 
 
 @dataclass(frozen=True)
@@ -225,39 +233,36 @@ def commit_record_upload_plan(
     failures = []
 
     for record in plan.records:
-        pages_dir = records_root / record.title / "pages"
-        record_labels_root = labels_root / record.title
-
-        for planned_file in record.files:
-            if planned_file.action == "skip":
-                skipped += 1
-                continue
-
-            try:
-                validate_page_filename(planned_file.name)
-                source = staging_root / Path(*planned_file.relative_path.parts)
-                destination = pages_dir / planned_file.name
-                sidecar = record_labels_root / PurePosixPath(planned_file.name).with_suffix(
-                    ".json"
-                ).name
-
-                if destination.exists():
-                    skipped += 1
-                    continue
-
-                pages_dir.mkdir(parents=True, exist_ok=True)
-                record_labels_root.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source, destination)
-                if not sidecar.exists():
-                    with sidecar.open("w", encoding="utf-8") as fh:
-                        json.dump({"annotations": []}, fh, ensure_ascii=False, indent=2)
+        pending = [planned_file for planned_file in record.files if planned_file.action != "skip"]
+        skipped += len(record.files) - len(pending)
+        if not pending:
+            continue
+
+        import_page = partial(
+            _import_planned_page,
+            staging_root=staging_root,
+            pages_dir=records_root / record.title / "pages",
+            record_labels_root=labels_root / record.title,
+            dirs_ready=threading.Event(),
+        )
+        # Page copies are independent and shutil.copy2 releases the GIL in the kernel copy.
+        if len(pending) < COMMIT_PARALLEL_MIN or COMMIT_WORKERS < 2:
+            outcomes = [import_page(planned_file) for planned_file in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=COMMIT_WORKERS) as executor:
+                outcomes = list(executor.map(import_page, pending))
+
+        for planned_file, (outcome, reason) in zip(pending, outcomes):
+            if outcome == "imported":
                 imported += 1
-            except (OSError, LayoutDetectionError) as exc:
+            elif outcome == "skipped":
+                skipped += 1
+            else:
                 failures.append(
                     RecordUploadFailure(
                         record_title=record.title,
                         filename=planned_file.name,
-                        reason=str(exc),
+                        reason=reason,
                     )
                 )
 
@@ -269,6 +274,39 @@ def commit_record_upload_plan(
     )
 
 
+def _import_planned_page(
+    planned_file: PlannedRecordUploadFile,
+    *,
+    staging_root: Path,
+    pages_dir: Path,
+    record_labels_root: Path,
+    dirs_ready: threading.Event,
+) -> Tuple[str, str]:
+    try:
+        validate_page_filename(planned_file.name)
+        source = staging_root / Path(*planned_file.relative_path.parts)
+        destination = pages_dir / planned_file.name
+        sidecar = record_labels_root / PurePosixPath(planned_file.name).with_suffix(".json").name
+
+        if destination.exists():
+            return "skipped", ""
+
+        if not dirs_ready.is_set():
+            pages_dir.mkdir(parents=True, exist_ok=True)
+            record_labels_root.mkdir(parents=True, exist_ok=True)
+            dirs_ready.set()
+        shutil.copy2(source, destination)
+        try:
+            # Exclusive create: an existing sidecar is kept without a separate exists() probe.
+            with sidecar.open("xb") as fh:
+                fh.write(_EMPTY_SIDECAR_BYTES)
+        except FileExistsError:
+            pass
+        return "imported", ""
+    except (OSError, LayoutDetectionError) as exc:
+        return "failed", str(exc)
+
+
 def record_upload_plan_to_dict(plan: RecordUploadPlan) -> dict[str, Any]:
     return {
         "title": plan.title,
@@ -344,7 +382,9 @@ def _image_file_names(entries: Mapping[str, Any]) -> Tuple[str, ...]:
 
 
 def _is_supported_image_name(name: str) -> bool:
-    return PurePosixPath(name).suffix.lower() in SUPPORTED_IMAGE_EXTENSIONS
+    # Path.suffix semantics (a leading dot alone is no extension) without building a path.
+    stem, dot, ext = name.rpartition(".")
+    return bool(dot and stem) and f".{ext.lower()}" in SUPPORTED_IMAGE_EXTENSIONS
 
 
 def _is_ignored_entry(name: str, *, is_folder: bool) -> bool:
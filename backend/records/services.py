@@ -1,22 +1,31 @@
 from __future__ import annotations
 
-import json
 import math
+import os
+import re
 import shutil
 import tempfile
+import threading
 import uuid
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import islice
+from operator import attrgetter
 from datetime import datetime, timezone as dt_timezone
 from pathlib import Path, PurePosixPath
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
+import orjson
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from django.utils import timezone
 from django.utils.text import slugify
 
 from .importing import (
+    IGNORED_DIRECTORY_NAMES,
+    IGNORED_FILE_NAMES,
     LayoutDetectionError,
     RecordUploadCandidate,
     RecordUploadLayout,
@@ -28,18 +37,52 @@ from .importing import (
     record_upload_plan_from_dict,
     record_upload_plan_to_dict,
 )
+from .thumbnails import prewarm_thumbnails
 
 
 WORKSPACE_STATE_FILE: Path = settings.WORKSPACE_STATE_FILE
 WORKSPACE_ROOT: Path = settings.WORKSPACES_ROOT
 RECORD_UPLOAD_STAGING_ROOT: Path = settings.BASE_DIR / ".runtime" / "record_uploads"
+UPLOAD_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+UPLOAD_COPY_BUFFER_BYTES = 1024 * 1024
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff"}
+_ALLOWED_EXT_NODOT = frozenset(ext[1:] for ext in ALLOWED_EXTENSIONS)
 RECORD_METADATA_FILENAME = "metadata.json"
 LABELS_DIRNAME = "labels"
 ANNOTATIONS_SCHEMA_VERSION = 1
 METADATA_TEMPLATES_DIRNAME = "metadata_templates"
 DEFAULT_SHAPE_LABEL = "text"
 WORKSPACE_INFO_FILENAME = "workspace.json"
+BATCH_METADATA_PARALLEL_MIN = 8
+ZIP_EXTRACT_PARALLEL_MIN = 8
+ZIP_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+ZIP_MEMBER_READ_WHOLE_BYTES = 16 * 1024 * 1024
+PREALLOCATE_MIN_BYTES = 1024 * 1024
+# workspace.json / record metadata.json bytes keyed by path, tagged with st_mtime_ns;
+# None marks a file that is not a JSON object
+_JSON_DICT_CACHE: Dict[str, Tuple[int, Optional[bytes]]] = {}
+_JSON_DICT_CACHE_LOCK = threading.Lock()
+_NON_EMPTY_ANNOTATIONS_RE = re.compile(rb'"(?:shapes|annotations)"\s*:\s*\[\s*[^\s\]]')
+# Parsed active workspace keyed by the state file's (st_mtime_ns, st_size)
+_ACTIVE_CACHE: Optional[Tuple[Tuple[int, int], Workspace]] = None
+_ACTIVE_CACHE_LOCK = threading.Lock()
+# Record summaries keyed by record dir, tagged with the mtimes they were built from and the
+# pages directories whose mtimes the page count depends on
+_RECORD_SUMMARY_CACHE: Dict[
+    str, Tuple[Tuple[Optional[int], ...], Tuple[Tuple[str, int], ...], Record]
+] = {}
+_RECORD_SUMMARY_CACHE_LOCK = threading.Lock()
+# pages dir -> last walk of that tree, valid while every directory it walked keeps its mtime.
+_PAGES_SCAN_CACHE: Dict[str, "_PagesScan"] = {}
+_PAGES_SCAN_CACHE_LOCK = threading.Lock()
+# pages dir -> (directory mtimes the items were listed under, the record's items).
+_RECORD_ITEMS_CACHE: Dict[str, Tuple[Tuple[Tuple[str, int], ...], Tuple[Item, ...]]] = {}
+_RECORD_ITEMS_CACHE_LOCK = threading.Lock()
+# templates dir -> (per-file (name, mtime_ns, size) signature, sanitized templates).
+_METADATA_TEMPLATES_CACHE: Dict[str, Tuple[Tuple[Tuple[str, int, int], ...], List[Dict[str, Any]]]] = {}
+_METADATA_TEMPLATES_CACHE_LOCK = threading.Lock()
+WORKSPACE_COUNT_PARALLEL_MIN = 4
+WORKSPACE_COUNT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 DEFAULT_METADATA_TEMPLATE = {
     "id": "default",
@@ -71,7 +114,9 @@ DEFAULT_METADATA_TEMPLATE = {
 }
 
 
+@lru_cache(maxsize=512)
 def _slugify_identifier(value: str) -> str:
+    # slugify runs NFKC normalisation and two regex passes; titles repeat across uploads.
     return slugify(value, allow_unicode=True)
 
 
@@ -80,8 +125,13 @@ class Workspace:
     slug: str
     path: Path
 
+    @cached_property
+    def path_str(self) -> str:
+        # Listing helpers join onto this with os.path instead of building Path objects.
+        return os.fspath(self.path)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Item:
     id: str
     record: str
@@ -89,7 +139,7 @@ class Item:
     rel_path: Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Record:
     slug: str
     title: str
@@ -152,31 +202,71 @@ def list_workspaces() -> List[Workspace]:
     if not WORKSPACE_ROOT.exists():
         return []
 
-    workspaces: List[Workspace] = []
-    for child in sorted(WORKSPACE_ROOT.iterdir()):
-        if child.is_dir() and not child.name.startswith("."):
-            workspaces.append(Workspace(slug=child.name, path=child))
-    return workspaces
+    return [
+        Workspace(slug=entry.name, path=WORKSPACE_ROOT / entry.name)
+        for entry in _sorted_entries(WORKSPACE_ROOT)
+        if entry.is_dir() and not entry.name.startswith(".")
+    ]
 
 
-def _workspace_info_path(workspace: Workspace) -> Path:
-    return workspace.path / WORKSPACE_INFO_FILENAME
+def _sorted_entries(root: Union[str, Path]) -> List[os.DirEntry]:
+    """List ``root`` with scandir, sorted by name; DirEntry type checks reuse readdir's d_type."""
+    with os.scandir(root) as entries:
+        return sorted(entries, key=lambda entry: entry.name)
 
 
-def load_workspace_info(workspace: Workspace) -> Dict[str, Any]:
-    info_path = _workspace_info_path(workspace)
-    if not info_path.exists():
-        return {}
+def _read_json(path: Union[str, Path]) -> Any:
+    with open(path, "rb") as fh:
+        return orjson.loads(fh.read())
+
+
+def _dump_json(payload: Any) -> bytes:
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
+def _write_json(path: Union[str, Path], payload: Any) -> None:
+    # Replaced by rename, so a crash or a concurrent reader never sees a half-written file.
+    write_bytes_atomic(path, _dump_json(payload))
+    with _JSON_DICT_CACHE_LOCK:
+        _JSON_DICT_CACHE.pop(os.fspath(path), None)
+
+
+def _read_json_dict_cached(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Parse a small JSON object file, skipping the read while its mtime is unchanged.
+
+    Missing or invalid files read as ``{}``. The cache keeps the bytes and every call parses
+    them afresh, so callers own the whole returned dict, nested values included.
+    """
+    key = os.fspath(path)
     try:
-        with info_path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
-    except (json.JSONDecodeError, OSError):
+        mtime_ns = os.stat(key).st_mtime_ns
+    except OSError:
         return {}
+    cached = _JSON_DICT_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return orjson.loads(cached[1]) if cached[1] is not None else {}
+    try:
+        with open(key, "rb") as fh:
+            raw: Optional[bytes] = fh.read()
+        data = orjson.loads(raw)
+    except (orjson.JSONDecodeError, OSError):
+        raw, data = None, {}
     if not isinstance(data, dict):
-        return {}
+        raw, data = None, {}
+    with _JSON_DICT_CACHE_LOCK:
+        _JSON_DICT_CACHE[key] = (mtime_ns, raw)
     return data
 
 
+def _workspace_info_path(workspace: Workspace) -> str:
+    return os.path.join(workspace.path_str, WORKSPACE_INFO_FILENAME)
+
+
+def load_workspace_info(workspace: Workspace) -> Dict[str, Any]:
+    return _read_json_dict_cached(_workspace_info_path(workspace))
+
+
 def update_workspace_info(slug: str, *, title: Optional[str] = None) -> Dict[str, Any]:
     workspace = get_workspace(slug)
     info = load_workspace_info(workspace)
@@ -191,8 +281,7 @@ def update_workspace_info(slug: str, *, title: Optional[str] = None) -> Dict[str
 
     info_path = _workspace_info_path(workspace)
     try:
-        with info_path.open("w", encoding="utf-8") as fh:
-            json.dump(info, fh, ensure_ascii=False, indent=2)
+        _write_json(info_path, info)
     except OSError as exc:
         raise WorkspaceError(f"Failed to update workspace info: {exc}") from exc
     return info
@@ -213,18 +302,22 @@ def _state_payload_path() -> Path:
 
 
 def set_active_workspace(slug: str) -> Workspace:
+    global _ACTIVE_CACHE
     workspace = get_workspace(slug)
     payload = {"slug": workspace.slug}
-    with _state_payload_path().open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh)
+    with _ACTIVE_CACHE_LOCK:
+        _write_json(_state_payload_path(), payload)
+        # Prime the cache with what was just written: the next get_active_workspace is a
+        # single stat, and a same-size rewrite within one mtime tick cannot serve a stale slug.
+        stat = WORKSPACE_STATE_FILE.stat()
+        _ACTIVE_CACHE = ((stat.st_mtime_ns, stat.st_size), workspace)
     return workspace
 
 
 def _clear_active_workspace_if_matches(slug: str) -> None:
     try:
-        with WORKSPACE_STATE_FILE.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-    except (FileNotFoundError, json.JSONDecodeError):
+        payload = _read_json(WORKSPACE_STATE_FILE)
+    except (FileNotFoundError, orjson.JSONDecodeError):
         return
     if payload.get("slug") == slug:
         WORKSPACE_STATE_FILE.unlink(missing_ok=True)
@@ -266,8 +359,7 @@ def create_workspace(slug: str, *, title: Optional[str] = None) -> Workspace:
             workspace_info["title"] = title.strip()
 
         info_path = workspace_path / WORKSPACE_INFO_FILENAME
-        with info_path.open("w", encoding="utf-8") as fh:
-            json.dump(workspace_info, fh, ensure_ascii=False, indent=2)
+        _write_json(info_path, workspace_info)
 
         return Workspace(slug=cleaned_slug, path=workspace_path)
     except OSError as exc:
@@ -296,17 +388,19 @@ def import_workspace_from_upload(
         raise WorkspaceError(f"Workspace '{workspace_slug}' already exists.")
 
     with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        archive_path = tmp_path / "workspace.zip"
-        staging_root = tmp_path / "staging"
+        staging_root = Path(tmp_dir) / "staging"
         staging_root.mkdir()
 
-        with archive_path.open("wb") as buffer:
-            for chunk in upload_file.chunks():
-                buffer.write(chunk)
-
         try:
-            _extract_workspace_zip(archive_path, staging_root)
+            direct_source = _direct_zip_source(upload_file)
+            if direct_source is not None:
+                _extract_workspace_zip(direct_source, staging_root)
+            else:
+                # Same spooling as record uploads: only archives over the limit touch disk.
+                with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_BYTES) as buffer:
+                    _copy_upload(upload_file, buffer)
+                    buffer.seek(0)
+                    _extract_workspace_zip(buffer, staging_root)
         except zipfile.BadZipFile as exc:
             raise WorkspaceError("上傳的檔案不是合法的 ZIP 壓縮檔。") from exc
         except LayoutDetectionError as exc:
@@ -348,13 +442,8 @@ def export_workspace_to_zip(workspace: Workspace) -> Path:
 
     try:
         with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-            for path in sorted(workspace.path.rglob("*")):
-                if not path.is_file():
-                    continue
-                relative = path.relative_to(workspace.path)
-                if ".thumbnails" in relative.parts:
-                    continue
-                archive.write(path, Path(workspace.slug) / relative)
+            for rel_parts, path in _list_export_files(os.fspath(workspace.path)):
+                archive.write(path, "/".join((workspace.slug, *rel_parts)))
     except Exception:
         archive_path.unlink(missing_ok=True)
         raise
@@ -362,23 +451,57 @@ def export_workspace_to_zip(workspace: Workspace) -> Path:
     return archive_path
 
 
+def _list_export_files(root: str) -> List[Tuple[Tuple[str, ...], str]]:
+    """Files under ``root`` as sorted ``(relative parts, path)``; ``.thumbnails`` trees are never entered."""
+    files: List[Tuple[Tuple[str, ...], str]] = []
+    stack: List[Tuple[str, Tuple[str, ...]]] = [(root, ())]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name == ".thumbnails":
+                    continue
+                parts = prefix + (entry.name,)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, parts))
+                elif entry.is_file():
+                    files.append((parts, entry.path))
+    files.sort()
+    return files
+
+
 def get_active_workspace() -> Optional[Workspace]:
+    global _ACTIVE_CACHE
     try:
-        with WORKSPACE_STATE_FILE.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
+        stat = WORKSPACE_STATE_FILE.stat()
     except FileNotFoundError:
         return None
-    except json.JSONDecodeError:
-        return None
+    state_key = (stat.st_mtime_ns, stat.st_size)
 
-    slug = payload.get("slug")
-    if not slug:
-        return None
+    cached = _ACTIVE_CACHE
+    # The state file does not change when the workspace folder is removed behind our back.
+    if cached is not None and cached[0] == state_key and os.path.isdir(cached[1].path_str):
+        return cached[1]
 
-    try:
-        return get_workspace(slug)
-    except WorkspaceError:
-        return None
+    with _ACTIVE_CACHE_LOCK:
+        try:
+            payload = _read_json(WORKSPACE_STATE_FILE)
+        except FileNotFoundError:
+            return None
+        except orjson.JSONDecodeError:
+            return None
+
+        slug = payload.get("slug")
+        workspace: Optional[Workspace] = None
+        if slug:
+            try:
+                workspace = get_workspace(slug)
+            except WorkspaceError:
+                workspace = None
+        # A missing workspace is not cached so it is picked up once it is created.
+        if workspace is not None:
+            _ACTIVE_CACHE = (state_key, workspace)
+        return workspace
 
 
 def _records_root(workspace: Workspace) -> Path:
@@ -389,23 +512,27 @@ def _labels_root(workspace: Workspace, record_slug: str) -> Path:
     return workspace.path / LABELS_DIRNAME / record_slug
 
 
-def _record_metadata_path(record_path: Path) -> Path:
-    return record_path / RECORD_METADATA_FILENAME
+def _record_metadata_path(record_path: Union[str, Path]) -> str:
+    return os.path.join(record_path, RECORD_METADATA_FILENAME)
 
 
-def _metadata_templates_root(workspace: Workspace) -> Path:
-    return workspace.path / METADATA_TEMPLATES_DIRNAME
+def _clean_str(value: Any) -> Optional[str]:
+    """Return ``value`` stripped, or ``None`` for non-strings and blanks; clean strings are not copied."""
+    if not isinstance(value, str) or not value:
+        return None
+    if value[0].isspace() or value[-1].isspace():
+        value = value.strip()
+    return value or None
 
 
 def _sanitize_metadata_template(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if not isinstance(data, dict):
         return None
-    template_id = data.get("id")
-    if not isinstance(template_id, str) or not template_id.strip():
+    template_id = _clean_str(data.get("id"))
+    if template_id is None:
         return None
-    template_id = template_id.strip()
     label = data.get("label")
-    if not isinstance(label, str) or not label.strip():
+    if _clean_str(label) is None:
         label = template_id
     description = data.get("description")
     if description is not None and not isinstance(description, str):
@@ -419,15 +546,14 @@ def _sanitize_metadata_template(data: Dict[str, Any]) -> Optional[Dict[str, Any]
     for raw_field in fields_payload:
         if not isinstance(raw_field, dict):
             continue
-        key = raw_field.get("key")
-        if not isinstance(key, str) or not key.strip():
+        key = _clean_str(raw_field.get("key"))
+        if key is None:
             continue
-        key = key.strip()
         field_label = raw_field.get("label")
-        if not isinstance(field_label, str) or not field_label.strip():
+        if _clean_str(field_label) is None:
             field_label = key
         field_type = raw_field.get("type")
-        if not isinstance(field_type, str) or not field_type.strip():
+        if _clean_str(field_type) is None:
             field_type = "text"
         default_value = raw_field.get("default")
         if default_value is None:
@@ -451,29 +577,67 @@ def _sanitize_metadata_template(data: Dict[str, Any]) -> Optional[Dict[str, Any]
     }
 
 
+# Built once; callers only serialize templates, so the shared dict is returned as-is.
+_DEFAULT_TEMPLATE_SANITIZED = _sanitize_metadata_template(DEFAULT_METADATA_TEMPLATE)
+
+
 def list_metadata_templates(workspace: Workspace) -> List[Dict[str, Any]]:
+    """
+    Sanitized templates from the workspace's template folder, then the default template.
+
+    Parsed templates are reused while every ``*.json`` file keeps its name, mtime and size, so
+    a metadata request costs one scandir and one stat per template instead of reading them all.
+    """
+    templates_root = os.path.join(workspace.path_str, METADATA_TEMPLATES_DIRNAME)
+    try:
+        entries = _sorted_entries(templates_root)
+    except (FileNotFoundError, NotADirectoryError):
+        entries = []
+
+    paths: List[str] = []
+    signature: List[Tuple[str, int, int]] = []
+    for entry in entries:
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+        except OSError:
+            continue
+        paths.append(entry.path)
+        signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+
+    key = tuple(signature)
+    cached = _METADATA_TEMPLATES_CACHE.get(templates_root)
+    if cached is not None and cached[0] == key:
+        return list(cached[1])
+
+    templates = _load_metadata_templates(paths)
+    with _METADATA_TEMPLATES_CACHE_LOCK:
+        _METADATA_TEMPLATES_CACHE[templates_root] = (key, templates)
+    return list(templates)
+
+
+def _load_metadata_templates(paths: Iterable[str]) -> List[Dict[str, Any]]:
     templates: List[Dict[str, Any]] = []
     seen_ids: set[str] = set()
 
-    templates_root = _metadata_templates_root(workspace)
-    if templates_root.exists():
-        for path in sorted(templates_root.glob("*.json")):
-            try:
-                with path.open("r", encoding="utf-8") as fh:
-                    raw = json.load(fh)
-            except (OSError, json.JSONDecodeError):
-                continue
-            template = _sanitize_metadata_template(raw)
-            if not template:
-                continue
-            if template["id"] in seen_ids:
-                continue
-            seen_ids.add(template["id"])
-            templates.append(template)
+    for path in paths:
+        try:
+            raw = _read_json(path)
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        template = _sanitize_metadata_template(raw)
+        if not template:
+            continue
+        if template["id"] in seen_ids:
+            continue
+        seen_ids.add(template["id"])
+        templates.append(template)
 
-    default_template = _sanitize_metadata_template(DEFAULT_METADATA_TEMPLATE)
-    if default_template and default_template["id"] not in seen_ids:
-        templates.append(default_template)
+    if _DEFAULT_TEMPLATE_SANITIZED and _DEFAULT_TEMPLATE_SANITIZED["id"] not in seen_ids:
+        templates.append(_DEFAULT_TEMPLATE_SANITIZED)
 
     return templates
 
@@ -482,70 +646,171 @@ def _normalize_metadata_values(values: Optional[Dict[str, Any]]) -> Dict[str, st
     if not isinstance(values, dict):
         return {}
     normalized: Dict[str, str] = {}
-    for key, value in values.items():
-        if not isinstance(key, str):
-            continue
-        key = key.strip()
-        if not key:
+    for raw_key, value in values.items():
+        key = _clean_str(raw_key)
+        if key is None:
             continue
         normalized[key] = "" if value is None else str(value)
     return normalized
 
 
 def _parse_item_id(item_id: str) -> Tuple[str, str]:
-    parts = item_id.split("/", 1)
-    if len(parts) != 2 or not parts[0] or not parts[1]:
+    # Without a separator the tail is empty, so one check covers both failure modes.
+    record_slug, _, filename = item_id.partition("/")
+    if not record_slug or not filename:
         raise WorkspaceError("Invalid item identifier.")
-    return parts[0], parts[1]
+    return record_slug, filename
 
 
-def _load_record_metadata(record_path: Path) -> Dict[str, Any]:
-    metadata_path = _record_metadata_path(record_path)
-    if not metadata_path.exists():
-        return {}
-    try:
-        with metadata_path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
-    except (json.JSONDecodeError, OSError):
-        return {}
-    if not isinstance(data, dict):
-        return {}
-    return data
+def _load_record_metadata(record_path: Union[str, Path]) -> Dict[str, Any]:
+    return _read_json_dict_cached(_record_metadata_path(record_path))
 
 
+@lru_cache(maxsize=4096)
 def _derive_record_title(slug: str) -> str:
     candidate = slug.replace("-", " ").replace("_", " ").strip()
     return candidate.title() if candidate else slug
 
 
-def _count_pages(record_path: Path) -> int:
-    pages_dir = record_path / "pages"
-    if not pages_dir.exists():
-        return 0
-    count = 0
-    for image_path in pages_dir.rglob("*"):
-        if not image_path.is_file():
+@dataclass(frozen=True, slots=True)
+class _PagesScan:
+    # Every directory walked, with the mtime it had just before it was listed.
+    dirs: Tuple[Tuple[str, int], ...]
+    image_count: int
+    file_count: int
+
+
+def _dirs_unchanged(dirs: Iterable[Tuple[str, int]]) -> bool:
+    # Adding, removing or renaming an entry bumps its parent's mtime, including new subfolders.
+    for path, mtime_ns in dirs:
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _walk_pages(pages_dir: str) -> Optional[_PagesScan]:
+    """Walk ``pages_dir`` with a scandir stack; ``None`` when it cannot be listed."""
+    dirs: List[Tuple[str, int]] = []
+    image_count = 0
+    file_count = 0
+    stack = [pages_dir]
+    while stack:
+        path = stack.pop()
+        try:
+            # Stat before listing: a change made mid-walk leaves an outdated mtime behind,
+            # so the next lookup walks again instead of trusting a partial view.
+            mtime_ns = os.stat(path).st_mtime_ns
+            entries = os.scandir(path)
+        except OSError:
+            if path == pages_dir:
+                return None
             continue
-        if image_path.suffix.lower() in ALLOWED_EXTENSIONS:
-            count += 1
-    return count
+        dirs.append((path, mtime_ns))
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        file_count += 1
+                        if _has_allowed_extension(entry.name):
+                            image_count += 1
+                except OSError:
+                    continue
+    return _PagesScan(dirs=tuple(dirs), image_count=image_count, file_count=file_count)
+
+
+def _rescan_pages(pages_dir: str) -> Optional[_PagesScan]:
+    scan = _walk_pages(pages_dir)
+    with _PAGES_SCAN_CACHE_LOCK:
+        if scan is None:
+            _PAGES_SCAN_CACHE.pop(pages_dir, None)
+        else:
+            _PAGES_SCAN_CACHE[pages_dir] = scan
+    return scan
+
+
+def _scan_pages(pages_dir: str) -> Optional[_PagesScan]:
+    """Counts for ``pages_dir``, reused while no directory in the tree has changed."""
+    cached = _PAGES_SCAN_CACHE.get(pages_dir)
+    if cached is not None and _dirs_unchanged(cached.dirs):
+        return cached
+    return _rescan_pages(pages_dir)
+
+
+def _count_pages(
+    record_path: Union[str, Path], metadata: Optional[Dict[str, Any]] = None
+) -> Tuple[int, Tuple[Tuple[str, int], ...]]:
+    """
+    Number of page images in a record, plus the ``(dir, mtime_ns)`` pairs it stays valid for.
+
+    When ``metadata`` is given, a ``page_count`` stamped at upload with the current pages
+    directory mtime is trusted as-is, so a fresh process lists records without walking every
+    ``pages/`` tree. Reads never write the stamp back; a stale one just falls through to a count.
+    """
+    pages_dir = os.path.join(record_path, "pages")
+    if metadata is not None:
+        recorded = metadata.get("page_count")
+        stamped_mtime_ns = metadata.get("pages_mtime_ns")
+        if isinstance(recorded, int) and stamped_mtime_ns is not None:
+            try:
+                mtime_ns = os.stat(pages_dir).st_mtime_ns
+            except OSError:
+                return 0, ()
+            # Only a flat pages/ is stamped, and it stays flat until its own mtime moves.
+            if mtime_ns == stamped_mtime_ns:
+                return recorded, ((pages_dir, mtime_ns),)
+    scan = _scan_pages(pages_dir)
+    if scan is None:
+        return 0, ()
+    return scan.image_count, scan.dirs
+
+
+def _invalidate_page_caches() -> None:
+    with _PAGES_SCAN_CACHE_LOCK:
+        _PAGES_SCAN_CACHE.clear()
+    with _RECORD_ITEMS_CACHE_LOCK:
+        _RECORD_ITEMS_CACHE.clear()
+    with _RECORD_SUMMARY_CACHE_LOCK:
+        _RECORD_SUMMARY_CACHE.clear()
 
 
 def _has_annotations(workspace: Workspace, record_slug: str) -> bool:
     """Check if a record has any annotation files with non-empty 'shapes' or 'annotations' arrays."""
-    labels_root = _labels_root(workspace, record_slug)
-    if not labels_root.exists():
+    try:
+        return _labels_dir_has_annotations(_labels_root(workspace, record_slug))
+    except (FileNotFoundError, NotADirectoryError):
         return False
 
+
+def _labels_dir_has_annotations(labels_dir: str | Path) -> bool:
     # Iterate through .json sidecar files and check their 'shapes' or 'annotations' fields.
-    for path in labels_root.glob("*.json"):
-        if not path.is_file():
+    with os.scandir(labels_dir) as entries:
+        sidecars = [
+            entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()
+        ]
+    if not sidecars:
+        # Fresh records have an empty labels dir: no sidecar opens at all.
+        return False
+    for path in sidecars:
+        try:
+            with open(path, "rb") as fh:
+                raw = fh.read()
+        except OSError:
+            # Ignore unreadable files.
             continue
+        # Byte scan first: no non-empty array under either key means nothing to parse.
+        if not _NON_EMPTY_ANNOTATIONS_RE.search(raw):
+            continue
+        if b'"ocr_result"' not in raw:
+            return True
+        # Nested OCR output could carry the same key names; confirm at the top level.
         try:
-            with path.open("r", encoding="utf-8") as fh:
-                payload = json.load(fh)
-        except (OSError, json.JSONDecodeError):
-            # Ignore unreadable/invalid files.
+            payload = orjson.loads(raw)
+        except orjson.JSONDecodeError:
             continue
         if isinstance(payload, dict):
             raw_shapes = payload.get("shapes")
@@ -557,45 +822,54 @@ def _has_annotations(workspace: Workspace, record_slug: str) -> bool:
     return False
 
 
-def _record_completion_count(workspace: Workspace, record_slug: str, record_path: Path) -> int:
-    labels_root = _labels_root(workspace, record_slug)
-    pages_dir = record_path / "pages"
-    if not labels_root.exists() or not pages_dir.exists():
+def _record_completion_count(workspace: Workspace, record_slug: str, record_path: Union[str, Path]) -> int:
+    labels_dir = os.path.join(workspace.path_str, LABELS_DIRNAME, record_slug)
+    if not os.path.isdir(labels_dir):
         return 0
 
     completed = 0
-    for image_path in pages_dir.rglob("*"):
-        if not image_path.is_file() or image_path.suffix.lower() not in ALLOWED_EXTENSIONS:
-            continue
-        sidecar_path = labels_root / image_path.with_suffix(".json").name
-        if not sidecar_path.is_file():
-            continue
+    for name, _ in _iter_page_images(os.path.join(record_path, "pages")):
+        sidecar_path = os.path.join(labels_dir, os.path.splitext(name)[0] + ".json")
         try:
-            with sidecar_path.open("r", encoding="utf-8") as fh:
-                payload = json.load(fh)
-        except (OSError, json.JSONDecodeError):
+            payload = _read_json(sidecar_path)
+        except (OSError, orjson.JSONDecodeError):
+            # Missing sidecars land here too; no separate is_file() probe.
             continue
         if isinstance(payload, dict) and payload.get("completed") is True:
             completed += 1
     return completed
 
 
-def _parse_created_at(metadata: Dict[str, Any], record_path: Path) -> datetime:
+def _parse_created_at(metadata: Dict[str, Any], record_path: Union[str, Path]) -> datetime:
+    """``created_at`` from metadata, else the directory mtime (stat only happens on that fallback)."""
     value = metadata.get("created_at")
     if isinstance(value, str):
-        try:
-            parsed = datetime.fromisoformat(value)
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=dt_timezone.utc)
+        parsed = _parse_iso_utc(value)
+        if parsed is not None:
             return parsed
-        except ValueError:
-            pass
-    return datetime.fromtimestamp(record_path.stat().st_mtime, tz=dt_timezone.utc)
+    return datetime.fromtimestamp(os.stat(record_path).st_mtime, tz=dt_timezone.utc)
 
 
-def _annotation_payload_path(workspace: Workspace, record_slug: str, filename: str) -> Path:
-    labels_root = _labels_root(workspace, record_slug)
-    return labels_root / Path(filename).with_suffix(".json")
+@lru_cache(maxsize=4096)
+def _parse_iso_utc(value: str) -> Optional[datetime]:
+    # Listings re-parse the same created_at strings on every poll; datetimes are immutable.
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def _annotation_payload_path(workspace: Workspace, record_slug: str, filename: str) -> str:
+    # Plain string join: this runs per item in batch operations and feeds os-level I/O directly.
+    return os.path.join(
+        os.fspath(workspace.path),
+        LABELS_DIRNAME,
+        record_slug,
+        os.path.splitext(filename)[0] + ".json",
+    )
 
 
 def _shapes_to_annotations(shapes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -604,7 +878,9 @@ def _shapes_to_annotations(shapes: List[Dict[str, Any]]) -> List[Dict[str, Any]]
         points = shape.get("points")
         if not isinstance(points, list) or not points:
             continue
-        numeric_points: List[Tuple[float, float]] = []
+        # Single pass for the bounding box; no intermediate point lists.
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
         for point in points:
             if (
                 isinstance(point, (list, tuple))
@@ -612,15 +888,18 @@ def _shapes_to_annotations(shapes: List[Dict[str, Any]]) -> List[Dict[str, Any]]
                 and isinstance(point[0], (int, float))
                 and isinstance(point[1], (int, float))
             ):
-                numeric_points.append((float(point[0]), float(point[1])))
-        if not numeric_points:
+                x = float(point[0])
+                y = float(point[1])
+                if x < min_x:
+                    min_x = x
+                if x > max_x:
+                    max_x = x
+                if y < min_y:
+                    min_y = y
+                if y > max_y:
+                    max_y = y
+        if min_x == math.inf:
             continue
-        xs = [pt[0] for pt in numeric_points]
-        ys = [pt[1] for pt in numeric_points]
-        min_x = min(xs)
-        max_x = max(xs)
-        min_y = min(ys)
-        max_y = max(ys)
 
         raw_group_id = shape.get("group_id")
         if isinstance(raw_group_id, (int, float)) and math.isfinite(raw_group_id):
@@ -659,8 +938,17 @@ def _shapes_to_annotations(shapes: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     return annotations
 
 
+def _box_corners(boxes: Sequence[Tuple[float, float, float, float]]) -> List[List[List[float]]]:
+    """Clockwise quad corners for each ``(x, y, width, height)`` box."""
+    return [
+        [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+        for x, y, width, height in boxes
+    ]
+
+
 def _annotations_to_shapes(annotations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    shapes: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    boxes: List[Tuple[float, float, float, float]] = []
     for index, annotation in enumerate(annotations):
         try:
             x = float(annotation.get("x", 0))
@@ -669,14 +957,13 @@ def _annotations_to_shapes(annotations: List[Dict[str, Any]]) -> List[Dict[str,
             height = float(annotation.get("height", 0))
         except (TypeError, ValueError):
             continue
+        valid.append((index, annotation))
+        boxes.append((x, y, width, height))
 
-        points = [
-            [x, y],
-            [x + width, y],
-            [x + width, y + height],
-            [x, y + height],
-        ]
+    corners = _box_corners(boxes)
 
+    shapes: List[Dict[str, Any]] = []
+    for (index, annotation), points in zip(valid, corners):
         raw_group_id = annotation.get("group_id")
         if isinstance(raw_group_id, (int, float)) and math.isfinite(raw_group_id):
             normalized_group_id: Optional[int] = int(raw_group_id)
@@ -721,21 +1008,42 @@ def _annotations_to_shapes(annotations: List[Dict[str, Any]]) -> List[Dict[str,
 def load_annotations(workspace: Workspace, item_id: str) -> Dict[str, Any]:
     record_slug, filename = _parse_item_id(item_id)
     sidecar_path = _annotation_payload_path(workspace, record_slug, filename)
-    if not sidecar_path.exists():
-        return {
-            "schema_version": ANNOTATIONS_SCHEMA_VERSION,
-            "annotations": [],
-            "shapes": [],
-            "metadata": {},
-            "updated_at": timezone.now().isoformat(),
-        }
+    return _parse_annotations_payload(_read_sidecar_bytes(sidecar_path))
+
+
+def annotations_etag(workspace: Workspace, item_id: str) -> Optional[str]:
+    """Weak validator for an item's annotations sidecar; ``None`` while no sidecar exists."""
+    record_slug, filename = _parse_item_id(item_id)
+    try:
+        stat = os.stat(_annotation_payload_path(workspace, record_slug, filename))
+    except OSError:
+        return None
+    return f'W/"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _read_sidecar_bytes(sidecar_path: str) -> Optional[bytes]:
     try:
-        with sidecar_path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-    except (json.JSONDecodeError, OSError):
-        payload = {}
+        with open(sidecar_path, "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return b""
+
+
+def _parse_annotations_payload(raw: Optional[bytes]) -> Dict[str, Any]:
+    """Normalize sidecar bytes (``None`` when the file is missing) into the annotations payload."""
+    if raw is None:
+        return _empty_annotations_payload()
+    try:
+        payload = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        payload = None
     if not isinstance(payload, dict):
-        payload = {}
+        # Corrupt or non-object sidecar: the empty payload, without the normalization passes.
+        empty = _empty_annotations_payload()
+        empty["completed"] = False
+        return empty
 
     payload.setdefault("schema_version", ANNOTATIONS_SCHEMA_VERSION)
 
@@ -747,7 +1055,6 @@ def load_annotations(workspace: Workspace, item_id: str) -> Dict[str, Any]:
         annotations = raw_annotations
         if not shapes:
             shapes = _annotations_to_shapes(annotations)
-            payload["shapes"] = shapes
     else:
         annotations = _shapes_to_annotations(shapes)
 
@@ -757,38 +1064,123 @@ def load_annotations(workspace: Workspace, item_id: str) -> Dict[str, Any]:
     payload["completed"] = bool(payload.get("completed", False))
 
     metadata_values = payload.get("metadata")
-    payload["metadata"] = _normalize_metadata_values(
-        metadata_values if isinstance(metadata_values, dict) else {}
-    )
+    payload["metadata"] = _normalize_metadata_values(metadata_values) if metadata_values else {}
     return payload
 
 
+def _empty_annotations_payload() -> Dict[str, Any]:
+    # Missing sidecar: no parse, no normalization passes, one clock read.
+    return {
+        "schema_version": ANNOTATIONS_SCHEMA_VERSION,
+        "annotations": [],
+        "shapes": [],
+        "metadata": {},
+        "updated_at": timezone.now().isoformat(),
+    }
+
+
+def _build_file_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an annotations payload to what is stored in the sidecar (annotations are derived)."""
+    schema_version = payload.get("schema_version")
+    file_payload = {
+        "schema_version": schema_version if isinstance(schema_version, int) else ANNOTATIONS_SCHEMA_VERSION,
+        "shapes": payload["shapes"],
+        "metadata": payload["metadata"],
+        "updated_at": payload["updated_at"],
+    }
+    if payload.get("completed"):
+        file_payload["completed"] = True
+    if isinstance(payload.get("ocr_result"), dict):
+        file_payload["ocr_result"] = payload["ocr_result"]
+    return file_payload
+
+
 def clear_record_annotations(workspace: Workspace, record_slug: str) -> int:
     items = list(iter_items(workspace, record_slug=record_slug))
-    cleared = 0
-    for item in items:
-        save_annotations(
-            workspace,
-            item.id,
+    # Every page gets the same empty sidecar, so it is encoded once and fanned out.
+    payload_bytes = _dump_json(
+        _build_file_payload(
             {
-                "annotations": [],
+                "schema_version": ANNOTATIONS_SCHEMA_VERSION,
                 "shapes": [],
                 "metadata": {},
+                "updated_at": timezone.now().isoformat(),
                 "ocr_result": {},
-            },
+            }
         )
-        cleared += 1
-    return cleared
+    )
+    sidecar_paths = [
+        _annotation_payload_path(workspace, record_slug, item.filename) for item in items
+    ]
+    if len(sidecar_paths) < BATCH_METADATA_PARALLEL_MIN:
+        for sidecar_path in sidecar_paths:
+            write_bytes_atomic(sidecar_path, payload_bytes)
+    else:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(lambda path: write_bytes_atomic(path, payload_bytes), sidecar_paths):
+                pass
+    _forget_record_summary(workspace, record_slug)
+    return len(sidecar_paths)
+
+
+def write_bytes_atomic(path: Union[str, Path], data: bytes) -> None:
+    """Write ``data`` to a sibling temp file and rename it over ``path``, so readers never see a partial file.
+
+    The parent directory is created only when the first write reports it missing.
+    """
+    path = os.fspath(path)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        try:
+            _write_fd(tmp_path, data)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_fd(tmp_path, data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
 
+def _write_fd(path: str, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
-def save_annotations(workspace: Workspace, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+
+def save_annotations(
+    workspace: Workspace,
+    item_id: str,
+    data: Dict[str, Any],
+    *,
+    existing_payload: Optional[Dict[str, Any]] = None,
+    updated_at: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Persist annotations for an item.
+
+    When ``data`` has no ``metadata`` the current sidecar values are preserved; callers
+    that already hold the result of ``load_annotations`` can pass it as
+    ``existing_payload`` to skip re-reading the file. Batch callers may pass one
+    ``updated_at`` timestamp for every item instead of taking the clock per save.
+    Raises ``WorkspaceError`` when the page does not exist.
+    """
+    # Ensure the item exists.
+    get_item(workspace, item_id)
     record_slug, filename = _parse_item_id(item_id)
     sidecar_path = _annotation_payload_path(workspace, record_slug, filename)
-    sidecar_path.parent.mkdir(parents=True, exist_ok=True)
 
     preserve_existing_metadata = "metadata" not in data
-    existing_payload: Optional[Dict[str, Any]] = None
-    if preserve_existing_metadata:
+    if not preserve_existing_metadata:
+        existing_payload = None
+    elif existing_payload is None:
         existing_payload = load_annotations(workspace, item_id)
 
     shapes_input = data.get("shapes")
@@ -838,75 +1230,95 @@ def save_annotations(workspace: Workspace, item_id: str, data: Dict[str, Any]) -
         "annotations": annotations,
         "shapes": shapes,
         "metadata": metadata_values,
-        "updated_at": timezone.now().isoformat(),
+        "updated_at": updated_at or timezone.now().isoformat(),
         "completed": completed_value,
     }
     if ocr_result_payload is not None:
         payload["ocr_result"] = ocr_result_payload
 
-    file_payload = {
-        "schema_version": schema_version,
-        "shapes": shapes,
-        "metadata": metadata_values,
-        "updated_at": payload["updated_at"],
-    }
-    if completed_value:
-        file_payload["completed"] = True
-    if ocr_result_payload is not None:
-        file_payload["ocr_result"] = ocr_result_payload
-
-    with sidecar_path.open("w", encoding="utf-8") as fh:
-        json.dump(file_payload, fh, ensure_ascii=False, indent=2)
+    write_bytes_atomic(sidecar_path, _dump_json(_build_file_payload(payload)))
+    _forget_record_summary(workspace, record_slug)
 
     return payload
 
 
 def list_records(workspace: Workspace) -> List[Record]:
-    records_path = _records_root(workspace)
-    if not records_path.exists():
+    records_dir = os.path.join(workspace.path_str, "records")
+    try:
+        entries = _sorted_entries(records_dir)
+    except (FileNotFoundError, NotADirectoryError):
         return []
+    return [
+        _summarize_record(workspace, entry.name, entry.path) for entry in entries if entry.is_dir()
+    ]
 
-    records: List[Record] = []
-    for record_dir in sorted(records_path.iterdir()):
-        if not record_dir.is_dir():
-            continue
-        metadata = _load_record_metadata(record_dir)
-        slug = record_dir.name
-        title = metadata.get("title") or _derive_record_title(slug)
-        page_count = _count_pages(record_dir)
-        created_at = _parse_created_at(metadata, record_dir)
-        source = metadata.get("source") if isinstance(metadata.get("source"), dict) else None
-        has_annotations = _has_annotations(workspace, slug)
-        completed_count = _record_completion_count(workspace, slug, record_dir)
-        completion_percent = round((completed_count / page_count) * 100) if page_count else 0
-        records.append(
-            Record(
-                slug=slug,
-                title=title,
-                created_at=created_at,
-                page_count=page_count,
-                source=source,
-                has_annotations=has_annotations,
-                completed_count=completed_count,
-                completion_percent=completion_percent,
-            )
-        )
-    return records
+
+def workspace_counts(workspace: Workspace) -> Tuple[int, int]:
+    """
+    ``(record_count, page_count)`` for the workspace summary, where pages are all files under
+    each record's ``pages/``. Per-record counts are cached by the mtimes of every directory in
+    the pages tree, so a repeat poll costs one scandir plus one stat per pages directory;
+    records that changed are re-walked, on a thread pool when there are several.
+    """
+    records_dir = os.path.join(workspace.path_str, "records")
+    try:
+        with os.scandir(records_dir) as entries:
+            record_dirs = [entry.path for entry in entries if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return 0, 0
+
+    page_count = 0
+    stale: List[str] = []
+    for record_dir in record_dirs:
+        pages_dir = os.path.join(record_dir, "pages")
+        cached = _PAGES_SCAN_CACHE.get(pages_dir)
+        if cached is not None and _dirs_unchanged(cached.dirs):
+            page_count += cached.file_count
+        else:
+            stale.append(pages_dir)
+    if not stale:
+        return len(record_dirs), page_count
+
+    # Record walks are independent and spend their time in scandir/stat, which release the GIL.
+    if len(stale) < WORKSPACE_COUNT_PARALLEL_MIN or WORKSPACE_COUNT_WORKERS < 2:
+        scans = [_rescan_pages(pages_dir) for pages_dir in stale]
+    else:
+        with ThreadPoolExecutor(max_workers=min(WORKSPACE_COUNT_WORKERS, len(stale))) as executor:
+            scans = list(executor.map(_rescan_pages, stale))
+    return len(record_dirs), page_count + sum(scan.file_count for scan in scans if scan is not None)
 
 
 def get_record(workspace: Workspace, slug: str) -> Record:
     record_path = _records_root(workspace) / slug
     if not record_path.exists() or not record_path.is_dir():
         raise RecordError(f"Record '{slug}' does not exist.")
-    metadata = _load_record_metadata(record_path)
+    return _summarize_record(workspace, slug, os.fspath(record_path))
+
+
+def _summarize_record(workspace: Workspace, slug: str, record_dir: str) -> Record:
+    """
+    Build the ``Record`` for one record directory, reusing the last result while nothing it
+    depends on has changed.
+
+    The key is the mtimes of the record dir, ``pages/``, ``metadata.json`` and the labels dir,
+    plus every nested pages directory the count was taken from. Sidecars are always replaced
+    by rename, so any annotation or completion change bumps the labels dir mtime.
+    """
+    labels_dir = os.path.join(workspace.path_str, LABELS_DIRNAME, slug)
+    key = _record_summary_key(record_dir, labels_dir)
+    cached = _RECORD_SUMMARY_CACHE.get(record_dir)
+    if cached is not None and cached[0] == key and _dirs_unchanged(cached[1]):
+        return cached[2]
+
+    metadata = _load_record_metadata(record_dir)
     title = metadata.get("title") or _derive_record_title(slug)
-    page_count = _count_pages(record_path)
-    created_at = _parse_created_at(metadata, record_path)
+    page_count, pages_dirs = _count_pages(record_dir, metadata)
+    created_at = _parse_created_at(metadata, record_dir)
     source = metadata.get("source") if isinstance(metadata.get("source"), dict) else None
     has_annotations = _has_annotations(workspace, slug)
-    completed_count = _record_completion_count(workspace, slug, record_path)
+    completed_count = _record_completion_count(workspace, slug, record_dir)
     completion_percent = round((completed_count / page_count) * 100) if page_count else 0
-    return Record(
+    record = Record(
         slug=slug,
         title=title,
         created_at=created_at,
@@ -916,6 +1328,30 @@ def get_record(workspace: Workspace, slug: str) -> Record:
         completed_count=completed_count,
         completion_percent=completion_percent,
     )
+    with _RECORD_SUMMARY_CACHE_LOCK:
+        _RECORD_SUMMARY_CACHE[record_dir] = (key, pages_dirs, record)
+    return record
+
+
+def _forget_record_summary(workspace: Workspace, record_slug: str) -> None:
+    # In-process writers drop the entry outright instead of trusting mtime granularity.
+    with _RECORD_SUMMARY_CACHE_LOCK:
+        _RECORD_SUMMARY_CACHE.pop(os.path.join(workspace.path_str, "records", record_slug), None)
+
+
+def _record_summary_key(record_dir: str, labels_dir: str) -> Tuple[Optional[int], ...]:
+    key: List[Optional[int]] = []
+    for path in (
+        record_dir,
+        os.path.join(record_dir, "pages"),
+        _record_metadata_path(record_dir),
+        labels_dir,
+    ):
+        try:
+            key.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
 
 
 def get_record_metadata_payload(workspace: Workspace, slug: str) -> Dict[str, Any]:
@@ -965,28 +1401,32 @@ def update_record_metadata(
     return metadata_block
 
 
-def _write_record_metadata(record_path: Path, payload: Dict[str, Any]) -> None:
+def _write_record_metadata(record_path: Union[str, Path], payload: Dict[str, Any]) -> None:
+    created_at = payload.get("created_at")
+    if not isinstance(created_at, str) or _parse_iso_utc(created_at) is None:
+        # The rename below bumps the record dir mtime that created_at falls back to; pin it first.
+        try:
+            payload["created_at"] = _parse_created_at(payload, record_path).isoformat()
+        except OSError:
+            pass
     metadata_path = _record_metadata_path(record_path)
-    with metadata_path.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False, indent=2)
+    _write_json(metadata_path, payload)
+    with _RECORD_SUMMARY_CACHE_LOCK:
+        _RECORD_SUMMARY_CACHE.pop(os.fspath(record_path), None)
 
 
 def get_item(workspace: Workspace, item_id: str) -> Item:
     record_slug, filename = _parse_item_id(item_id)
-    records_dir = _records_root(workspace)
-    record_dir = records_dir / record_slug
-    if not record_dir.exists() or not record_dir.is_dir():
+    record_dir = os.path.join(workspace.path_str, "records", record_slug)
+    if not os.path.isdir(record_dir):
         raise WorkspaceError(f"Record '{record_slug}' does not exist.")
-    pages_dir = record_dir / "pages"
-    source_path = pages_dir / filename
-    if not source_path.exists() or not source_path.is_file():
+    if not os.path.isfile(os.path.join(record_dir, "pages", filename)):
         raise WorkspaceError(f"Page '{item_id}' does not exist.")
-    rel_path = source_path.relative_to(workspace.path)
     return Item(
         id=item_id,
         record=record_slug,
         filename=filename,
-        rel_path=rel_path,
+        rel_path=Path("records", record_slug, "pages", filename),
     )
 
 
@@ -1002,25 +1442,25 @@ def update_item_metadata(
     metadata: Optional[Dict[str, Any]],
     *,
     merge: bool,
+    updated_at: Optional[str] = None,
 ) -> Dict[str, str]:
     # Ensure the item exists.
     get_item(workspace, item_id)
-    existing_payload = load_annotations(workspace, item_id)
-    existing_metadata = existing_payload.get("metadata")
-    existing_metadata = _normalize_metadata_values(
-        existing_metadata if isinstance(existing_metadata, dict) else {}
-    )
+    # One read, one parse and one encode: the sidecar is rewritten straight from
+    # the parsed state instead of round-tripping through save_annotations.
+    record_slug, filename = _parse_item_id(item_id)
+    sidecar_path = _annotation_payload_path(workspace, record_slug, filename)
+    state = _parse_annotations_payload(_read_sidecar_bytes(sidecar_path))
     incoming = _normalize_metadata_values(metadata)
     if merge:
-        merged = existing_metadata.copy()
-        merged.update(incoming)
-        metadata_to_save = merged
+        metadata_to_save = {**state["metadata"], **incoming}
     else:
         metadata_to_save = incoming
-    existing_payload["metadata"] = metadata_to_save
-    saved_payload = save_annotations(workspace, item_id, existing_payload)
-    saved_metadata = saved_payload.get("metadata")
-    return _normalize_metadata_values(saved_metadata if isinstance(saved_metadata, dict) else {})
+    state["metadata"] = metadata_to_save
+    state["updated_at"] = updated_at or timezone.now().isoformat()
+    write_bytes_atomic(sidecar_path, _dump_json(_build_file_payload(state)))
+    _forget_record_summary(workspace, record_slug)
+    return dict(metadata_to_save)
 
 
 def batch_update_items_metadata(
@@ -1034,17 +1474,32 @@ def batch_update_items_metadata(
         "updated": [],
         "failed": [],
     }
-    for item_id in item_ids:
+    # The whole batch is one edit, so every sidecar gets the same timestamp.
+    batch_updated_at = timezone.now().isoformat()
+
+    def _update(item_id: str) -> Tuple[str, Optional[Dict[str, str]], Optional[str]]:
         try:
             updated = update_item_metadata(
-                workspace,
-                item_id,
-                metadata,
-                merge=merge,
+                workspace, item_id, metadata, merge=merge, updated_at=batch_updated_at
             )
-            results["updated"].append({"item": item_id, "metadata": updated})
+            return item_id, updated, None
         except WorkspaceError as exc:
-            results["failed"].append({"item": item_id, "error": str(exc)})
+            return item_id, None, str(exc)
+
+    # Each item owns its own sidecar, so updates are independent; small batches
+    # are not worth the pool start-up.
+    if len(item_ids) < BATCH_METADATA_PARALLEL_MIN:
+        outcomes = [_update(item_id) for item_id in item_ids]
+    else:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(_update, item_ids))
+
+    for item_id, updated, error in outcomes:
+        if error is None:
+            results["updated"].append({"item": item_id, "metadata": updated})
+        else:
+            results["failed"].append({"item": item_id, "error": error})
     results["updated_count"] = len(results["updated"])
     results["failed_count"] = len(results["failed"])
     return results
@@ -1058,6 +1513,7 @@ def delete_record(workspace: Workspace, slug: str) -> None:
 
     # Delete the record directory and all its contents
     shutil.rmtree(record_path, ignore_errors=False)
+    _invalidate_page_caches()
 
     # Delete associated labels/annotations
     labels_path = _labels_root(workspace, slug)
@@ -1093,13 +1549,17 @@ def preview_records_from_upload(
 
     session_root, staging_root = _create_record_upload_session()
     try:
-        archive_path = session_root / "upload.zip"
-        with archive_path.open("wb") as buffer:
-            for chunk in upload_file.chunks():
-                buffer.write(chunk)
-
         try:
-            tree = _extract_upload_zip_to_tree(archive_path, staging_root)
+            direct_source = _direct_zip_source(upload_file)
+            if direct_source is not None:
+                # Django's own temp file, or a small in-memory upload, is read in place.
+                tree = _extract_upload_zip_to_tree(direct_source, staging_root)
+            else:
+                # Otherwise spool: only archives over the limit touch disk.
+                with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_BYTES) as buffer:
+                    _copy_upload(upload_file, buffer)
+                    buffer.seek(0)
+                    tree = _extract_upload_zip_to_tree(buffer, staging_root)
         except zipfile.BadZipFile as exc:
             raise RecordError("上傳的檔案不是合法的 ZIP 壓縮檔。") from exc
         except LayoutDetectionError as exc:
@@ -1166,12 +1626,12 @@ def preview_records_from_file_batch(
             if not is_zip_entry_inside_staging(relative_path, staging_root):
                 raise RecordError("上傳資料夾內含有不安全的路徑，已拒絕上傳。")
 
-            destination = staging_root / Path(*PurePosixPath(relative_path).parts)
+            relative_parts = _zip_member_parts(relative_path)
+            destination = staging_root.joinpath(*relative_parts)
             destination.parent.mkdir(parents=True, exist_ok=True)
             with destination.open("wb") as buffer:
-                for chunk in upload_file.chunks():
-                    buffer.write(chunk)
-            _add_file_to_upload_tree(tree, relative_path)
+                _copy_upload(upload_file, buffer)
+            _add_file_to_upload_tree(tree, relative_parts)
 
         root_record_name = _slugify_identifier(slug or title or root_name or "upload")
         if not root_record_name:
@@ -1198,8 +1658,7 @@ def commit_staged_record_upload(workspace: Workspace, *, upload_id: str) -> Reco
         raise RecordError("Upload preview 已失效，請重新選擇檔案。")
 
     try:
-        with metadata_path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
+        payload = _read_json(metadata_path)
         plan = record_upload_plan_from_dict(payload.get("plan", {}))
         source_name = payload.get("source_name") or "upload"
         commit_result = commit_record_upload_plan(
@@ -1209,9 +1668,20 @@ def commit_staged_record_upload(workspace: Workspace, *, upload_id: str) -> Reco
             labels_root=workspace.path / LABELS_DIRNAME,
         )
         _refresh_uploaded_record_metadata(workspace, plan, source_name)
+        _invalidate_page_caches()
     finally:
         shutil.rmtree(session_root, ignore_errors=True)
 
+    prewarm_thumbnails(
+        workspace,
+        (
+            PurePosixPath("records", planned_record.title, "pages", planned_file.name)
+            for planned_record in plan.records
+            for planned_file in planned_record.files
+            if planned_file.action == "import"
+        ),
+    )
+
     records: List[Record] = []
     for planned_record in plan.records:
         try:
@@ -1261,9 +1731,38 @@ def create_record_from_upload(
     return result.records[0]
 
 
-def _extract_upload_zip_to_tree(archive_path: Path, staging_root: Path) -> Dict[str, Any]:
+def _direct_zip_source(upload_file: UploadedFile) -> Optional[Union[str, BinaryIO]]:
+    """
+    Something ``ZipFile`` can open without copying the upload first, if there is one.
+
+    Uploads Django already streamed to disk are opened by path; small seekable in-memory
+    uploads are rewound and read in place.
+    """
+    temporary_file_path = getattr(upload_file, "temporary_file_path", None)
+    if callable(temporary_file_path):
+        return temporary_file_path()
+    source = getattr(upload_file, "file", None)
+    if source is None or upload_file.size >= UPLOAD_SPOOL_MAX_BYTES:
+        return None
+    seekable = getattr(source, "seekable", None)
+    if seekable is None or not seekable():
+        return None
+    source.seek(0)
+    return source
+
+
+def _copy_upload(upload_file: UploadedFile, destination: BinaryIO) -> None:
+    # One copyfileobj with a 1 MiB buffer instead of a Python loop over chunks().
+    if getattr(upload_file, "seekable", None) and upload_file.seekable():
+        upload_file.seek(0)
+    shutil.copyfileobj(upload_file, destination, UPLOAD_COPY_BUFFER_BYTES)
+
+
+def _extract_upload_zip_to_tree(archive_file: Union[str, Path, BinaryIO], staging_root: Path) -> Dict[str, Any]:
     tree: Dict[str, Any] = {}
-    with zipfile.ZipFile(archive_path) as archive:
+    with zipfile.ZipFile(archive_file) as archive:
+        members: List[zipfile.ZipInfo] = []
+        seen_names: set[str] = set()
         for member in archive.infolist():
             member_name = member.filename
             if not member_name or member.is_dir():
@@ -1273,16 +1772,98 @@ def _extract_upload_zip_to_tree(archive_path: Path, staging_root: Path) -> Dict[
                     "unsafe_zip_entry",
                     "ZIP 檔內含有不安全的路徑，已拒絕上傳。",
                 )
-
-            member_path = Path(*PurePosixPath(member_name).parts)
-            destination = staging_root / member_path
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            with archive.open(member) as src, destination.open("wb") as dst:
-                shutil.copyfileobj(src, dst)
-            _add_file_to_upload_tree(tree, member_name)
+            parts = _zip_member_parts(member_name)
+            # Layout detection hides these anyway, so they are never extracted.
+            if parts[-1] in IGNORED_FILE_NAMES or not IGNORED_DIRECTORY_NAMES.isdisjoint(parts[:-1]):
+                continue
+            if member_name in seen_names:
+                raise LayoutDetectionError(
+                    "duplicate_zip_entry",
+                    "ZIP 檔內含有重複的檔案路徑，已拒絕上傳。",
+                )
+            seen_names.add(member_name)
+            members.append(member)
+            _add_file_to_upload_tree(tree, parts)
+        _extract_zip_members(archive, archive_file, members, staging_root)
     return tree
 
 
+def _extract_zip_members(
+    archive: zipfile.ZipFile,
+    archive_file: Union[str, Path, BinaryIO],
+    members: Sequence[zipfile.ZipInfo],
+    staging_root: Path,
+) -> None:
+    """
+    Copy already-validated ``members`` under ``staging_root``.
+
+    Archives that live on disk are split across threads, each with its own ``ZipFile``
+    (a single instance is not safe to share); in-memory sources stay sequential.
+    """
+    # Record uploads reject duplicate entry paths before this point, so their destinations are
+    # unique. Workspace archives are not screened, so a repeated name keeps its last member.
+    jobs: Dict[str, zipfile.ZipInfo] = {}
+    for member in members:
+        jobs[os.path.join(staging_root, *_zip_member_parts(member.filename))] = member
+    for parent in {os.path.dirname(destination) for destination in jobs}:
+        os.makedirs(parent, exist_ok=True)
+
+    # Archive order (local header offset), not name order: reads stream forward through the file.
+    items = sorted(jobs.items(), key=lambda job: job[1].header_offset)
+
+    if (
+        not isinstance(archive_file, (str, Path))
+        or len(items) < ZIP_EXTRACT_PARALLEL_MIN
+        or ZIP_EXTRACT_WORKERS < 2
+    ):
+        for destination, member in items:
+            _copy_zip_member(archive, member, destination)
+        return
+
+    # Contiguous runs of roughly equal compressed size, so each worker also reads sequentially.
+    total_compressed = sum(member.compress_size for _, member in items) or 1
+    shards: List[List[Tuple[str, zipfile.ZipInfo]]] = [[] for _ in range(ZIP_EXTRACT_WORKERS)]
+    consumed = 0
+    for destination, member in items:
+        index = min(consumed * ZIP_EXTRACT_WORKERS // total_compressed, ZIP_EXTRACT_WORKERS - 1)
+        shards[index].append((destination, member))
+        consumed += member.compress_size
+    shards = [shard for shard in shards if shard]
+
+    def _extract_shard(shard: List[Tuple[str, zipfile.ZipInfo]]) -> None:
+        with zipfile.ZipFile(archive_file) as shard_archive:
+            for destination, member in shard:
+                _copy_zip_member(shard_archive, member, destination)
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        for _ in executor.map(_extract_shard, shards):
+            pass
+
+
+def _copy_zip_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo, destination: str) -> None:
+    if member.file_size <= ZIP_MEMBER_READ_WHOLE_BYTES:
+        # Typical page scans: one inflate call and one write, CRC still verified by read().
+        data = archive.read(member)
+        with open(destination, "wb") as dst:
+            _preallocate(dst, member.file_size)
+            dst.write(data)
+        return
+    with archive.open(member) as src, open(destination, "wb") as dst:
+        _preallocate(dst, member.file_size)
+        shutil.copyfileobj(src, dst, UPLOAD_COPY_BUFFER_BYTES)
+
+
+def _preallocate(dst: BinaryIO, size: int) -> None:
+    # Reserve extents for large scans up front so they are laid out contiguously for later reads.
+    if size < PREALLOCATE_MIN_BYTES or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(dst.fileno(), 0, size)
+    except OSError:
+        # Unsupported filesystem or no space to reserve: the plain write reports real failures.
+        pass
+
+
 def _create_record_upload_session() -> Tuple[Path, Path]:
     RECORD_UPLOAD_STAGING_ROOT.mkdir(parents=True, exist_ok=True)
     session_root = RECORD_UPLOAD_STAGING_ROOT / uuid.uuid4().hex
@@ -1306,8 +1887,7 @@ def _write_record_upload_session(session_root: Path, plan: RecordUploadPlan, sou
         "source_name": source_name,
         "plan": record_upload_plan_to_dict(plan),
     }
-    with (session_root / "plan.json").open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False, indent=2)
+    _write_json(session_root / "plan.json", payload)
 
 
 def _build_record_upload_plan(
@@ -1330,8 +1910,13 @@ def _build_record_upload_plan(
         raise RecordError(str(exc)) from exc
 
 
-def _add_file_to_upload_tree(tree: Dict[str, Any], member_name: str) -> None:
-    parts = PurePosixPath(member_name).parts
+def _zip_member_parts(member_name: str) -> Tuple[str, ...]:
+    # PurePosixPath(name).parts for the relative names that passed the staging check,
+    # without building a path object per archive entry.
+    return tuple(part for part in member_name.split("/") if part and part != ".")
+
+
+def _add_file_to_upload_tree(tree: Dict[str, Any], parts: Sequence[str]) -> None:
     cursor = tree
     for part in parts[:-1]:
         child = cursor.setdefault(part, {})
@@ -1342,8 +1927,9 @@ def _add_file_to_upload_tree(tree: Dict[str, Any], member_name: str) -> None:
         cursor[parts[-1]] = None
 
 
-def _extract_workspace_zip(archive_path: Path, staging_root: Path) -> None:
+def _extract_workspace_zip(archive_path: Union[str, Path, BinaryIO], staging_root: Path) -> None:
     with zipfile.ZipFile(archive_path) as archive:
+        members: List[zipfile.ZipInfo] = []
         for member in archive.infolist():
             member_name = member.filename
             if not member_name or member.is_dir():
@@ -1355,29 +1941,26 @@ def _extract_workspace_zip(archive_path: Path, staging_root: Path) -> None:
                 )
             if _is_thumbnail_zip_entry(member_name):
                 continue
-
-            member_path = Path(*PurePosixPath(member_name).parts)
-            destination = staging_root / member_path
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            with archive.open(member) as src, destination.open("wb") as dst:
-                shutil.copyfileobj(src, dst)
+            members.append(member)
+        _extract_zip_members(archive, archive_path, members, staging_root)
 
 
 def _is_thumbnail_zip_entry(member_name: str) -> bool:
-    return ".thumbnails" in PurePosixPath(member_name).parts
+    return ".thumbnails" in _zip_member_parts(member_name)
 
 
 def _detect_workspace_import_root(staging_root: Path) -> Path:
     if (staging_root / "records").is_dir() and (staging_root / LABELS_DIRNAME).is_dir():
         return staging_root
 
-    candidates = [
-        child
-        for child in staging_root.iterdir()
-        if child.is_dir()
-        and (child / "records").is_dir()
-        and (child / LABELS_DIRNAME).is_dir()
-    ]
+    with os.scandir(staging_root) as entries:
+        candidates = [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_dir()
+            and os.path.isdir(os.path.join(entry.path, "records"))
+            and os.path.isdir(os.path.join(entry.path, LABELS_DIRNAME))
+        ]
     if len(candidates) == 1:
         return candidates[0]
     if len(candidates) > 1:
@@ -1408,8 +1991,7 @@ def _write_imported_workspace_info(
     title = fallback_title
 
     info_path = target_path / WORKSPACE_INFO_FILENAME
-    with info_path.open("w", encoding="utf-8") as fh:
-        json.dump({"title": title}, fh, ensure_ascii=False, indent=2)
+    _write_json(info_path, {"title": title})
 
 
 def _count_workspace_pages(workspace: Workspace) -> int:
@@ -1437,15 +2019,19 @@ def _existing_pages_by_record(workspace: Workspace) -> Dict[str, set[str]]:
         return {}
 
     existing: Dict[str, set[str]] = {}
-    for record_dir in records_dir.iterdir():
-        pages_dir = record_dir / "pages"
-        if not record_dir.is_dir() or not pages_dir.exists():
+    with os.scandir(records_dir) as record_entries:
+        record_dirs = [entry for entry in record_entries if entry.is_dir()]
+    for record_entry in record_dirs:
+        try:
+            page_entries = os.scandir(os.path.join(record_entry.path, "pages"))
+        except (FileNotFoundError, NotADirectoryError):
             continue
-        existing[record_dir.name] = {
-            path.name
-            for path in pages_dir.iterdir()
-            if path.is_file() and path.suffix.lower() in ALLOWED_EXTENSIONS
-        }
+        with page_entries:
+            existing[record_entry.name] = {
+                entry.name
+                for entry in page_entries
+                if _has_allowed_extension(entry.name) and entry.is_file()
+            }
     return existing
 
 
@@ -1465,42 +2051,128 @@ def _refresh_uploaded_record_metadata(
         metadata.setdefault("slug", planned_record.title)
         metadata.setdefault("title", _derive_record_title(planned_record.title))
         metadata.setdefault("created_at", created_at.isoformat())
-        metadata["page_count"] = _count_pages(record_path)
+        scan = _rescan_pages(os.path.join(record_path, "pages"))
+        metadata["page_count"] = scan.image_count if scan is not None else 0
+        # Only a flat pages/ is fully described by its own mtime; nested trees are always
+        # counted. The walk stats before listing, so a change mid-count leaves the stamp stale.
+        if scan is not None and len(scan.dirs) == 1:
+            metadata["pages_mtime_ns"] = scan.dirs[0][1]
+        else:
+            metadata.pop("pages_mtime_ns", None)
         metadata.setdefault("source", {"type": "upload", "name": upload_name})
         _write_record_metadata(record_path, metadata)
 
 
-def iter_items(workspace: Workspace, record_slug: Optional[str] = None) -> Iterable[Item]:
-    records_dir = _records_root(workspace)
-    if not records_dir.exists():
-        return []
+def iter_items(workspace: Workspace, *, record_slug: Optional[str] = None) -> Iterable[Item]:
+    """Yield items ordered by ``(record, filename)``; ``filter_items`` relies on this order."""
+    for record_items in _record_item_groups(workspace, record_slug):
+        yield from record_items
 
+
+def paginate_workspace_items(
+    workspace: Workspace,
+    *,
+    record_slug: Optional[str] = None,
+    page: int,
+    page_size: int,
+) -> Tuple[List[Item], int]:
+    """
+    One page of items in the default ``(record, filename)`` order, plus the total count.
+
+    Works on the per-record item tuples directly: records before the window are skipped by
+    length and no list of every item in the workspace is built.
+    """
+    start = max(page - 1, 0) * page_size
+    end = start + page_size
+    window: List[Item] = []
+    offset = 0
+    for record_items in _record_item_groups(workspace, record_slug):
+        count = len(record_items)
+        if offset + count > start and offset < end:
+            window.extend(record_items[max(start - offset, 0):end - offset])
+        offset += count
+    return window, offset
+
+
+def _record_item_groups(workspace: Workspace, record_slug: Optional[str]) -> List[Tuple[Item, ...]]:
+    records_dir = os.path.join(workspace.path_str, "records")
     if record_slug:
-        target = records_dir / record_slug
-        if not target.exists() or not target.is_dir():
+        # Only the requested record is touched; other records are never listed.
+        if not os.path.isdir(os.path.join(records_dir, record_slug)):
+            if not os.path.isdir(records_dir):
+                return []
             raise WorkspaceError(f"Record '{record_slug}' does not exist.")
-        record_dirs = [target]
+        record_names = [record_slug]
     else:
-        record_dirs = [d for d in sorted(records_dir.iterdir()) if d.is_dir()]
+        try:
+            with os.scandir(records_dir) as entries:
+                record_names = sorted(entry.name for entry in entries if entry.is_dir())
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    groups: List[Tuple[Item, ...]] = []
+    for record_name in record_names:
+        pages_dir = os.path.join(records_dir, record_name, "pages")
+        scan = _scan_pages(pages_dir)
+        if scan is None:
+            continue
+        # One slot per record, replaced when the tree changes, so a full sweep over any
+        # number of records never evicts the entries the next sweep needs.
+        cached = _RECORD_ITEMS_CACHE.get(pages_dir)
+        if cached is not None and cached[0] == scan.dirs:
+            groups.append(cached[1])
+            continue
+        items = _scan_record_items(workspace.path_str, record_name)
+        with _RECORD_ITEMS_CACHE_LOCK:
+            _RECORD_ITEMS_CACHE[pages_dir] = (scan.dirs, items)
+        groups.append(items)
+    return groups
 
-    for record_dir in record_dirs:
-        record_name = record_dir.name
-        pages_dir = record_dir / "pages"
-        if not pages_dir.exists():
+
+def _has_allowed_extension(name: str) -> bool:
+    # Same rule as Path.suffix (a leading dot alone is not an extension), without building a Path.
+    dot = name.rfind(".")
+    return dot > 0 and name[dot + 1:].lower() in _ALLOWED_EXT_NODOT
+
+
+def _iter_page_images(pages_dir: str) -> Iterable[Tuple[str, str]]:
+    """Yield ``(name, path)`` for supported images under ``pages_dir``, recursing with scandir."""
+    stack = [pages_dir]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
             continue
-        for image_path in sorted(pages_dir.rglob("*")):
-            if not image_path.is_file():
-                continue
-            if image_path.suffix.lower() not in ALLOWED_EXTENSIONS:
-                continue
-            rel_path = image_path.relative_to(workspace.path)
-            item_id = f"{record_name}/{image_path.name}"
-            yield Item(
-                id=item_id,
-                record=record_name,
-                filename=image_path.name,
-                rel_path=rel_path,
-            )
+        with entries:
+            for entry in entries:
+                # With a known d_type (ext4, tmpfs, overlayfs on those) both checks are free;
+                # only DT_UNKNOWN entries and symlinked pages cost a stat, which may fail.
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif _has_allowed_extension(entry.name) and entry.is_file():
+                        yield entry.name, entry.path
+                except OSError:
+                    continue
+
+
+def _scan_record_items(workspace_path: str, record_name: str) -> Tuple[Item, ...]:
+    """Walk one record's pages tree into sorted items; ``_record_item_groups`` caches the result."""
+    pages_dir = os.path.join(workspace_path, "records", record_name, "pages")
+    # Every walked path starts with the workspace prefix, so slicing replaces os.path.relpath.
+    prefix_len = len(os.path.join(workspace_path, ""))
+    images = sorted(
+        (name, path[prefix_len:].split(os.sep)) for name, path in _iter_page_images(pages_dir)
+    )
+    return tuple(
+        Item(
+            id=f"{record_name}/{name}",
+            record=record_name,
+            filename=name,
+            rel_path=Path(*rel_parts),
+        )
+        for name, rel_parts in images
+    )
 
 
 def filter_items(
@@ -1509,56 +2181,86 @@ def filter_items(
     query: Optional[str] = None,
     sort: Optional[str] = None,
 ) -> List[Item]:
-    filtered = list(items)
+    """Filter ``items`` (in ``iter_items`` order) by ``query`` and optionally re-sort by filename."""
     if query:
         q = query.lower()
         filtered = [
             item
-            for item in filtered
+            for item in items
             if q in item.filename.lower() or q in item.record.lower()
         ]
+    else:
+        filtered = list(items)
 
     sort_key = (sort or "record").lower()
     if sort_key == "filename":
-        filtered.sort(key=lambda item: item.filename)
-    else:
-        filtered.sort(key=lambda item: (item.record, item.filename))
+        filtered.sort(key=attrgetter("filename"))
+    # Otherwise the iter_items order is already (record, filename) and filtering keeps it.
     return filtered
 
 
-def paginate_items(items: Sequence[Item], *, page: int, page_size: int) -> Sequence[Item]:
+def paginate_items(items: Iterable[Item], *, page: int, page_size: int) -> Sequence[Item]:
+    """Slice one page out of ``items``; iterators are consumed only up to the end of the page."""
+    start = max(page - 1, 0) * page_size
+    end = start + page_size
+    if isinstance(items, Sequence):
+        return items[start:end]
+    return list(islice(items, start, end))
+
+
+def filter_and_paginate_items(
+    items: Iterable[Item],
+    *,
+    query: Optional[str] = None,
+    sort: Optional[str] = None,
+    page: int,
+    page_size: int,
+) -> Tuple[List[Item], int]:
+    """
+    ``filter_items`` then ``paginate_items``, returning the page and the number of matches.
+
+    In the default order a single pass counts matches and keeps only the page; sorting by
+    filename still needs every match, but only the page is handed back.
+    """
     start = max(page - 1, 0) * page_size
     end = start + page_size
-    return items[start:end]
+    if (sort or "record").lower() == "filename":
+        matches = filter_items(items, query=query, sort=sort)
+        return matches[start:end], len(matches)
+
+    q = query.lower() if query else None
+    window: List[Item] = []
+    total = 0
+    for item in items:
+        if q is not None and q not in item.filename.lower() and q not in item.record.lower():
+            continue
+        if start <= total < end:
+            window.append(item)
+        total += 1
+    return window, total
 
 
 def get_item_completed(workspace: Workspace, item_id: str) -> bool:
     record_slug, filename = _parse_item_id(item_id)
     sidecar_path = _annotation_payload_path(workspace, record_slug, filename)
-    if not sidecar_path.exists():
-        return False
     try:
-        with sidecar_path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
+        payload = _read_json(sidecar_path)
         return isinstance(payload, dict) and payload.get("completed") is True
-    except (json.JSONDecodeError, OSError):
+    except (orjson.JSONDecodeError, OSError):
         return False
 
 
 def set_item_completed(workspace: Workspace, item_id: str, completed: bool) -> bool:
     record_slug, filename = _parse_item_id(item_id)
     sidecar_path = _annotation_payload_path(workspace, record_slug, filename)
-    sidecar_path.parent.mkdir(parents=True, exist_ok=True)
 
     existing: Dict[str, Any] = {}
-    if sidecar_path.exists():
-        try:
-            with sidecar_path.open("r", encoding="utf-8") as fh:
-                raw = json.load(fh)
-            if isinstance(raw, dict):
-                existing = raw
-        except (json.JSONDecodeError, OSError):
-            pass
+    try:
+        raw = _read_json(sidecar_path)
+        if isinstance(raw, dict):
+            existing = raw
+    except (orjson.JSONDecodeError, OSError):
+        pass
 
     if completed:
         existing["completed"] = True
@@ -1567,7 +2269,7 @@ def set_item_completed(workspace: Workspace, item_id: str, completed: bool) -> b
 
     existing["updated_at"] = timezone.now().isoformat()
 
-    with sidecar_path.open("w", encoding="utf-8") as fh:
-        json.dump(existing, fh, ensure_ascii=False, indent=2)
+    write_bytes_atomic(sidecar_path, _dump_json(existing))
+    _forget_record_summary(workspace, record_slug)
 
     return completed
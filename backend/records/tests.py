@@ -5,9 +5,10 @@ import zipfile
 from pathlib import Path
 
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import SimpleTestCase
+from django.test import RequestFactory, SimpleTestCase, override_settings
 
 from . import services as record_services
+from . import views as record_views
 from .importing import (
     LayoutDetectionError,
     commit_record_upload_plan,
@@ -17,10 +18,13 @@ from .importing import (
     plan_record_upload,
     validate_page_filename,
 )
+from .thumbnails import prewarm_thumbnails
 from .services import (
+    Item,
     RecordError,
     Workspace,
     WorkspaceError,
+    clear_record_annotations,
     create_record_from_upload,
     create_records_from_file_batch,
     create_records_from_upload,
@@ -28,9 +32,19 @@ from .services import (
     delete_workspace,
     discard_staged_record_upload,
     export_workspace_to_zip,
+    filter_and_paginate_items,
+    get_active_workspace,
+    get_record,
     import_workspace_from_upload,
+    iter_items,
     list_records,
+    load_annotations,
+    paginate_workspace_items,
     preview_records_from_upload,
+    save_annotations,
+    update_item_metadata,
+    workspace_counts,
+    write_bytes_atomic,
 )
 
 
@@ -816,3 +830,330 @@ class WorkspaceImportTests(SimpleTestCase):
                     import_workspace_from_upload(upload_file=upload, workspace_name="demo")
             finally:
                 record_services.WORKSPACE_ROOT = old_root
+
+
+class ThumbnailPrewarmTests(SimpleTestCase):
+    def test_prewarm_is_off_by_default(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = Workspace(slug="demo", path=Path(tmp_dir))
+            pages_dir = workspace.path / "records" / "書" / "pages"
+            pages_dir.mkdir(parents=True)
+            (pages_dir / "001.png").write_bytes(MINIMAL_PNG)
+
+            futures = prewarm_thumbnails(workspace, [Path("records/書/pages/001.png")])
+
+            self.assertEqual(futures, [])
+            self.assertFalse((workspace.path / ".thumbnails").exists())
+
+    @override_settings(THUMBNAIL_PREWARM=True)
+    def test_prewarm_renders_thumbnails_when_enabled(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = Workspace(slug="demo", path=Path(tmp_dir))
+            pages_dir = workspace.path / "records" / "書" / "pages"
+            pages_dir.mkdir(parents=True)
+            (pages_dir / "001.png").write_bytes(MINIMAL_PNG)
+
+            futures = prewarm_thumbnails(workspace, [Path("records/書/pages/001.png")])
+            for future in futures:
+                future.result()
+
+            thumbnail = workspace.path / ".thumbnails" / "records" / "書" / "pages" / "001.jpg"
+            self.assertTrue(thumbnail.is_file())
+
+
+class RecordListingCacheTests(SimpleTestCase):
+    def test_nested_page_changes_invalidate_cached_listings(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = Workspace(slug="demo", path=Path(tmp_dir))
+            nested_dir = workspace.path / "records" / "第一冊" / "pages" / "卷一"
+            nested_dir.mkdir(parents=True)
+            (nested_dir / "001.png").write_bytes(MINIMAL_PNG)
+
+            self.assertEqual([item.filename for item in iter_items(workspace)], ["001.png"])
+            self.assertEqual(workspace_counts(workspace), (1, 1))
+            self.assertEqual(get_record(workspace, "第一冊").page_count, 1)
+
+            (nested_dir / "002.png").write_bytes(MINIMAL_PNG)
+
+            self.assertEqual(
+                [item.filename for item in iter_items(workspace)],
+                ["001.png", "002.png"],
+            )
+            self.assertEqual(workspace_counts(workspace), (1, 2))
+            self.assertEqual(get_record(workspace, "第一冊").page_count, 2)
+
+    def test_listing_records_does_not_rewrite_metadata(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = Workspace(slug="demo", path=Path(tmp_dir))
+            record_dir = workspace.path / "records" / "第一冊"
+            (record_dir / "pages").mkdir(parents=True)
+            (record_dir / "pages" / "001.png").write_bytes(MINIMAL_PNG)
+            metadata_path = record_dir / "metadata.json"
+            metadata_path.write_text('{"title": "第一冊"}', encoding="utf-8")
+            before = metadata_path.stat().st_mtime_ns
+
+            records = list_records(workspace)
+
+            self.assertEqual(records[0].page_count, 1)
+            self.assertEqual(metadata_path.stat().st_mtime_ns, before)
+            self.assertEqual(metadata_path.read_text(encoding="utf-8"), '{"title": "第一冊"}')
+
+    def test_paging_past_many_records_reuses_cached_items(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = Workspace(slug="demo", path=Path(tmp_dir))
+            for index in range(150):
+                pages_dir = workspace.path / "records" / f"record-{index:03d}" / "pages"
+                pages_dir.mkdir(parents=True)
+                (pages_dir / "001.png").write_bytes(MINIMAL_PNG)
+
+            scanned = []
+            original_scan = record_services._scan_record_items
+
+            def counting_scan(workspace_path, record_name):
+                scanned.append(record_name)
+                return original_scan(workspace_path, record_name)
+
+            record_services._scan_record_items = counting_scan
+            try:
+                first_page, total = paginate_workspace_items(workspace, page=1, page_size=50)
+                first_scans = len(scanned)
+                second_page, _ = paginate_workspace_items(workspace, page=2, page_size=50)
+            finally:
+                record_services._scan_record_items = original_scan
+
+            self.assertEqual(total, 150)
+            self.assertEqual(first_scans, 150)
+            self.assertEqual(len(scanned), 150)
+            self.assertEqual(first_page[0].record, "record-000")
+            self.assertEqual(second_page[0].record, "record-050")
+
+
+class ActiveWorkspaceTests(SimpleTestCase):
+    def test_active_workspace_is_none_once_its_folder_is_removed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspaces_root = Path(tmp_dir) / "workspaces"
+            state_file = Path(tmp_dir) / "state.json"
+            workspace_path = workspaces_root / "demo"
+            workspace_path.mkdir(parents=True)
+            state_file.write_text('{"slug": "demo"}', encoding="utf-8")
+
+            old_root = record_services.WORKSPACE_ROOT
+            old_state_file = record_services.WORKSPACE_STATE_FILE
+            record_services.WORKSPACE_ROOT = workspaces_root
+            record_services.WORKSPACE_STATE_FILE = state_file
+            try:
+                self.assertEqual(get_active_workspace().slug, "demo")
+                workspace_path.rmdir()
+                active = get_active_workspace()
+            finally:
+                record_services.WORKSPACE_ROOT = old_root
+                record_services.WORKSPACE_STATE_FILE = old_state_file
+
+            self.assertIsNone(active)
+
+
+class ZipExtractionTests(SimpleTestCase):
+    def test_archive_on_disk_is_extracted_across_threads(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            archive_path = Path(tmp_dir) / "export.zip"
+            entries = {
+                f"exported/records/冊{index % 3}/pages/{index:03d}.png": MINIMAL_PNG + bytes([index])
+                for index in range(record_services.ZIP_EXTRACT_PARALLEL_MIN * 3)
+            }
+            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+                for name, payload in entries.items():
+                    archive.writestr(name, payload)
+            staging_root = Path(tmp_dir) / "staging"
+            staging_root.mkdir()
+
+            old_workers = record_services.ZIP_EXTRACT_WORKERS
+            record_services.ZIP_EXTRACT_WORKERS = 4
+            try:
+                record_services._extract_workspace_zip(archive_path, staging_root)
+            finally:
+                record_services.ZIP_EXTRACT_WORKERS = old_workers
+
+            extracted = {
+                path.relative_to(staging_root).as_posix(): path.read_bytes()
+                for path in staging_root.rglob("*")
+                if path.is_file()
+            }
+            self.assertEqual(extracted, entries)
+
+
+def _workspace_with_pages(root: Path, record_slug: str, count: int) -> Workspace:
+    workspace = Workspace(slug="demo", path=root)
+    pages_dir = workspace.path / "records" / record_slug / "pages"
+    pages_dir.mkdir(parents=True)
+    for index in range(1, count + 1):
+        (pages_dir / f"{index:03d}.png").write_bytes(MINIMAL_PNG)
+    return workspace
+
+
+class AnnotationWriteTests(SimpleTestCase):
+    def test_save_annotations_replaces_sidecar_without_leftovers(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = _workspace_with_pages(Path(tmp_dir), "第一冊", 1)
+            shape = {"label": "text", "text": "甲", "points": [[0, 0], [1, 0], [1, 1], [0, 1]]}
+
+            save_annotations(workspace, "第一冊/001.png", {"shapes": [shape]})
+            save_annotations(workspace, "第一冊/001.png", {"shapes": [{**shape, "text": "乙"}]})
+
+            labels_dir = workspace.path / "labels" / "第一冊"
+            self.assertEqual([path.name for path in labels_dir.iterdir()], ["001.json"])
+            payload = load_annotations(workspace, "第一冊/001.png")
+            self.assertEqual([item["text"] for item in payload["shapes"]], ["乙"])
+
+    def test_failed_write_keeps_previous_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            target = Path(tmp_dir) / "001.json"
+            target.write_bytes(b'{"shapes": []}')
+
+            def failing_write(path, data):
+                with open(path, "wb") as fh:
+                    fh.write(data[:3])
+                raise OSError("disk full")
+
+            old_write_fd = record_services._write_fd
+            record_services._write_fd = failing_write
+            try:
+                with self.assertRaises(OSError):
+                    write_bytes_atomic(target, b'{"shapes": [1]}')
+            finally:
+                record_services._write_fd = old_write_fd
+
+            self.assertEqual(target.read_bytes(), b'{"shapes": []}')
+            self.assertEqual([path.name for path in Path(tmp_dir).iterdir()], ["001.json"])
+
+    def test_update_item_metadata_keeps_shapes_and_merges_values(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = _workspace_with_pages(Path(tmp_dir), "第一冊", 1)
+            shape = {"label": "text", "text": "甲", "points": [[0, 0], [1, 0], [1, 1], [0, 1]]}
+            save_annotations(
+                workspace, "第一冊/001.png", {"shapes": [shape], "metadata": {"作者": "甲", "年代": "清"}}
+            )
+
+            merged = update_item_metadata(workspace, "第一冊/001.png", {"年代": "明"}, merge=True)
+            self.assertEqual(merged, {"作者": "甲", "年代": "明"})
+
+            replaced = update_item_metadata(workspace, "第一冊/001.png", {"卷": "一"}, merge=False)
+            self.assertEqual(replaced, {"卷": "一"})
+
+            payload = load_annotations(workspace, "第一冊/001.png")
+            self.assertEqual(payload["metadata"], {"卷": "一"})
+            self.assertEqual([item["text"] for item in payload["shapes"]], ["甲"])
+
+    def test_clear_record_annotations_empties_every_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            page_count = record_services.BATCH_METADATA_PARALLEL_MIN + 2
+            workspace = _workspace_with_pages(Path(tmp_dir), "第一冊", page_count)
+            shape = {"label": "text", "text": "甲", "points": [[0, 0], [1, 0], [1, 1], [0, 1]]}
+            item_ids = [item.id for item in iter_items(workspace, record_slug="第一冊")]
+            for item_id in item_ids:
+                save_annotations(workspace, item_id, {"shapes": [shape], "metadata": {"作者": "甲"}})
+
+            cleared = clear_record_annotations(workspace, "第一冊")
+
+            self.assertEqual(cleared, page_count)
+            for item_id in item_ids:
+                payload = load_annotations(workspace, item_id)
+                self.assertEqual(payload["shapes"], [])
+                self.assertEqual(payload["metadata"], {})
+            labels_dir = workspace.path / "labels" / "第一冊"
+            self.assertEqual(len(list(labels_dir.iterdir())), page_count)
+
+
+class ItemPaginationTests(SimpleTestCase):
+    def _items(self, names):
+        return [
+            Item(
+                id=f"{record}/{filename}",
+                record=record,
+                filename=filename,
+                rel_path=Path("records", record, "pages", filename),
+            )
+            for record, filename in names
+        ]
+
+    def test_filter_and_paginate_items_counts_every_match(self):
+        items = self._items(
+            [("a", "001.png"), ("a", "002.png"), ("b", "001.png"), ("b", "cover.png")]
+        )
+
+        window, total = filter_and_paginate_items(items, page=2, page_size=3)
+        self.assertEqual(total, 4)
+        self.assertEqual([item.id for item in window], ["b/cover.png"])
+
+        window, total = filter_and_paginate_items(items, query="00", page=1, page_size=2)
+        self.assertEqual(total, 3)
+        self.assertEqual([item.id for item in window], ["a/001.png", "a/002.png"])
+
+        window, total = filter_and_paginate_items(items, query="00", page=5, page_size=2)
+        self.assertEqual(total, 3)
+        self.assertEqual(window, [])
+
+    def test_filter_and_paginate_items_sorted_by_filename(self):
+        items = self._items([("a", "002.png"), ("b", "001.png"), ("c", "cover.png")])
+
+        window, total = filter_and_paginate_items(items, sort="filename", page=1, page_size=2)
+
+        self.assertEqual(total, 3)
+        self.assertEqual([item.filename for item in window], ["001.png", "002.png"])
+
+
+class ItemRequestViewTests(SimpleTestCase):
+    def test_resolve_request_path_rejects_traversal(self):
+        factory = RequestFactory()
+        for unsafe in ("/etc/passwd", "../secret.png", "records/../../x.png", "records/..", "a\x00b"):
+            with self.subTest(path=unsafe):
+                request = factory.get("/items/thumbnail", {"path": unsafe})
+                self.assertIsNone(record_views._resolve_request_path(request))
+
+        request = factory.get("/items/thumbnail", {"path": "records/第一冊/pages/..001.png"})
+        self.assertEqual(
+            str(record_views._resolve_request_path(request)),
+            "records/第一冊/pages/..001.png",
+        )
+        self.assertIsNone(record_views._resolve_request_path(factory.get("/items/thumbnail")))
+
+    def test_item_annotations_revalidates_with_etag(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspaces_root = Path(tmp_dir) / "workspaces"
+            state_file = Path(tmp_dir) / "state.json"
+            workspace_path = workspaces_root / "demo"
+            pages_dir = workspace_path / "records" / "第一冊" / "pages"
+            labels_dir = workspace_path / "labels" / "第一冊"
+            pages_dir.mkdir(parents=True)
+            labels_dir.mkdir(parents=True)
+            (pages_dir / "001.png").write_bytes(MINIMAL_PNG)
+            (labels_dir / "001.json").write_text('{"shapes": []}', encoding="utf-8")
+            state_file.write_text('{"slug": "demo"}', encoding="utf-8")
+
+            factory = RequestFactory()
+            old_root = record_services.WORKSPACE_ROOT
+            old_state_file = record_services.WORKSPACE_STATE_FILE
+            record_services.WORKSPACE_ROOT = workspaces_root
+            record_services.WORKSPACE_STATE_FILE = state_file
+            try:
+                first = record_views.item_annotations_view(
+                    factory.get("/items/第一冊/001.png/annotations"), "第一冊/001.png"
+                )
+                etag = first["ETag"]
+                repeat = record_views.item_annotations_view(
+                    factory.get("/items/第一冊/001.png/annotations", HTTP_IF_NONE_MATCH=etag),
+                    "第一冊/001.png",
+                )
+                (labels_dir / "001.json").write_text('{"shapes": [{"label": "text"}]}', encoding="utf-8")
+                changed = record_views.item_annotations_view(
+                    factory.get("/items/第一冊/001.png/annotations", HTTP_IF_NONE_MATCH=etag),
+                    "第一冊/001.png",
+                )
+            finally:
+                record_services.WORKSPACE_ROOT = old_root
+                record_services.WORKSPACE_STATE_FILE = old_state_file
+
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(repeat.status_code, 304)
+            self.assertEqual(repeat["ETag"], etag)
+            self.assertEqual(changed.status_code, 200)
+            self.assertNotEqual(changed["ETag"], etag)
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path, PurePosixPath
+from typing import Iterable, List, Optional
 
+from django.conf import settings
 from PIL import Image
 
+try:
+    import pyvips
+except ImportError:
+    # Optional: libvips shrinks large TIFF scans on load instead of decoding them whole.
+    pyvips = None
+
 
 THUMBNAIL_SIZE = (320, 320)
+_THUMBNAIL_RESAMPLE = Image.Resampling.LANCZOS
+# optimize=True costs an extra Huffman pass once per page; every later request serves the smaller file.
+_THUMBNAIL_SAVE_OPTIONS = {"format": "JPEG", "quality": 85, "optimize": True}
+_VIPS_SUFFIXES = {".tif", ".tiff"}
+THUMBNAIL_PREWARM_WORKERS = min(4, os.cpu_count() or 1)
+_PREWARM_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_PREWARM_EXECUTOR_LOCK = threading.Lock()
+
+logger = logging.getLogger(__name__)
 
 
 def ensure_thumbnail(workspace, relative_path: PurePosixPath) -> Path:
@@ -14,21 +36,90 @@ def ensure_thumbnail(workspace, relative_path: PurePosixPath) -> Path:
     Returns the thumbnail path on disk.
     """
     source = workspace.path / relative_path
-    if not source.exists():
-        raise FileNotFoundError(source)
+    # Raises FileNotFoundError for a missing page, which callers map to 404.
+    source_mtime_ns = os.stat(source).st_mtime_ns
 
     thumb_root = workspace.path / ".thumbnails"
     thumb_rel = Path(relative_path).with_suffix(".jpg")
     thumb_path = thumb_root / thumb_rel
-    thumb_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if thumb_path.exists():
-        if thumb_path.stat().st_mtime >= source.stat().st_mtime:
+    # Cache hit is one stat per file; the directory is only created when rendering.
+    try:
+        if os.stat(thumb_path).st_mtime_ns >= source_mtime_ns:
             return thumb_path
+    except FileNotFoundError:
+        pass
+    thumb_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Written beside the target and renamed in, so a prewarm thread and a request rendering
+    # the same page never serve each other's half-written JPEG.
+    tmp_path = thumb_path.with_name(f"{thumb_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        _write_thumbnail(source, tmp_path)
+        os.replace(tmp_path, thumb_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return thumb_path
+
+
+def prewarm_thumbnails(workspace, relative_paths: Iterable[PurePosixPath]) -> List[Future]:
+    """
+    Queue thumbnail renders for freshly imported pages on the shared prewarm pool; returns
+    at once. Does nothing unless ``settings.THUMBNAIL_PREWARM`` is on; the returned futures
+    let callers wait for the renders.
+    """
+    if not settings.THUMBNAIL_PREWARM:
+        return []
+    executor = _prewarm_executor()
+    return [executor.submit(_prewarm_thumbnail, workspace, path) for path in relative_paths]
+
+
+def _prewarm_executor() -> ThreadPoolExecutor:
+    # One bounded pool per process, created on first use; Pillow releases the GIL while
+    # decoding and resizing, so a few workers keep up with an upload.
+    global _PREWARM_EXECUTOR
+    with _PREWARM_EXECUTOR_LOCK:
+        if _PREWARM_EXECUTOR is None:
+            _PREWARM_EXECUTOR = ThreadPoolExecutor(
+                max_workers=THUMBNAIL_PREWARM_WORKERS,
+                thread_name_prefix="thumbnail-prewarm",
+            )
+        return _PREWARM_EXECUTOR
+
+
+def _prewarm_thumbnail(workspace, path: PurePosixPath) -> None:
+    try:
+        ensure_thumbnail(workspace, path)
+    except Exception:  # pylint: disable=broad-except
+        # Best effort: the page view renders it lazily on demand anyway.
+        logger.debug("Thumbnail prewarm failed for %s", path, exc_info=True)
+
+
+def _write_thumbnail(source: Path, thumb_path: Path) -> None:
+    if pyvips is not None and source.suffix.lower() in _VIPS_SUFFIXES:
+        try:
+            _write_thumbnail_vips(source, thumb_path)
+            return
+        except pyvips.Error:
+            # Anything libvips cannot handle still gets the Pillow path below.
+            pass
 
     with Image.open(source) as img:
-        img = img.convert("RGB")
-        img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-        img.save(thumb_path, format="JPEG", quality=85, optimize=True)
+        # JPEG only: libjpeg decodes at the smallest 1/2, 1/4 or 1/8 scale still >= the
+        # thumbnail size, so far fewer pixels reach LANCZOS. Other formats ignore draft().
+        img.draft("RGB", THUMBNAIL_SIZE)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img.thumbnail(THUMBNAIL_SIZE, _THUMBNAIL_RESAMPLE)
+        img.save(thumb_path, **_THUMBNAIL_SAVE_OPTIONS)
 
-    return thumb_path
+
+def _write_thumbnail_vips(source: Path, thumb_path: Path) -> None:
+    # size="down" matches Image.thumbnail: small pages are never enlarged.
+    thumb = pyvips.Image.thumbnail(
+        str(source), THUMBNAIL_SIZE[0], height=THUMBNAIL_SIZE[1], size="down"
+    )
+    if thumb.hasalpha():
+        thumb = thumb.flatten()
+    thumb = thumb.colourspace("srgb")
+    thumb.jpegsave(str(thumb_path), Q=85, optimize_coding=True)
@@ -0,0 +1,54 @@
+from django.urls import path
+
+from .views import (
+    available_workspaces,
+    create_workspace_view,
+    current_workspace,
+    export_workspace_view,
+    import_workspace_view,
+    item_annotations_view,
+    item_completed_view,
+    item_metadata_batch_view,
+    item_metadata_view,
+    item_original,
+    item_thumbnail,
+    list_items_view,
+    open_workspace,
+    record_upload_cancel_view,
+    record_upload_commit_view,
+    record_upload_preview_view,
+    record_detail_view,
+    record_annotations_clear_view,
+    records_root,
+    record_metadata_view,
+    update_workspace,
+)
+
+urlpatterns = [
+    # Workspace
+    path('workspaces', available_workspaces),
+    path('workspaces/create', create_workspace_view),
+    path('workspaces/import', import_workspace_view),
+    path('workspace', current_workspace),
+    path('workspace/open', open_workspace),
+    path('workspaces/<str:slug>/export', export_workspace_view),
+    path('workspaces/<str:slug>', update_workspace),
+
+    # Records
+    path('records', records_root),
+    path('records/upload/preview', record_upload_preview_view),
+    path('records/upload/commit', record_upload_commit_view),
+    path('records/upload/cancel', record_upload_cancel_view),
+    path('records/<str:record_slug>', record_detail_view),
+    path('records/<str:record_slug>/annotations/clear', record_annotations_clear_view),
+    path('records/<str:record_slug>/metadata', record_metadata_view),
+
+    # Items
+    path('items', list_items_view),
+    path('items/thumbnail', item_thumbnail),
+    path('items/raw', item_original),
+    path('items/<path:item_id>/annotations', item_annotations_view),
+    path('items/<path:item_id>/completed', item_completed_view),
+    path('items/<path:item_id>/metadata', item_metadata_view),
+    path('items/metadata/batch', item_metadata_batch_view),
+]
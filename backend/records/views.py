@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-import json
-from pathlib import PurePosixPath
-from typing import Dict, List, Optional
-
-from django.http import FileResponse, Http404, HttpResponseBadRequest, JsonResponse
+import os
+import re
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Dict, Optional, Tuple
+
+import orjson
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotModified,
+)
+from django.utils.http import http_date, parse_etags
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
 from urllib.parse import quote
 
+from config.responses import json_response
+
 from .services import (
     RecordError,
     WorkspaceError,
+    annotations_etag,
     batch_update_items_metadata,
     commit_staged_record_upload,
     create_records_from_file_batch,
@@ -21,7 +35,7 @@ from .services import (
     delete_record,
     discard_staged_record_upload,
     export_workspace_to_zip,
-    filter_items,
+    filter_and_paginate_items,
     get_active_workspace,
     get_item,
     get_item_completed,
@@ -36,7 +50,7 @@ from .services import (
     list_workspaces,
     load_annotations,
     load_workspace_info,
-    paginate_items,
+    paginate_workspace_items,
     preview_records_from_file_batch,
     preview_records_from_upload,
     set_item_completed,
@@ -46,24 +60,31 @@ from .services import (
     save_annotations,
     set_active_workspace,
     clear_record_annotations,
+    workspace_counts,
 )
 from .thumbnails import ensure_thumbnail
 
+# FileResponse (and wsgi.file_wrapper, which is handed the same size) reads 4 KiB at a time by
+# default; multi-MB originals and workspace exports move in far fewer reads at 64 KiB.
+FILE_STREAM_BLOCK_SIZE = 64 * 1024
+# Page URLs are workspace-relative and a page can be replaced in place, so browsers keep the
+# bytes but revalidate each time; an unchanged file costs a 304 instead of a re-download.
+IMAGE_CACHE_CONTROL = "private, no-cache"
+# Absolute paths, any '..' segment, or NUL bytes; checked before a PurePosixPath is built.
+_UNSAFE_REQUEST_PATH_RE = re.compile(r"^/|(?:^|/)\.\.(?:/|$)|\x00")
+_ORIGINAL_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".tif": "image/tiff",
+    ".tiff": "image/tiff",
+}
+
 
 def _workspace_payload(workspace) -> Dict:
-    records_dir = workspace.path / "records"
-    record_count = 0
-    page_count = 0
     info = load_workspace_info(workspace)
-    if records_dir.exists():
-        for record_dir in records_dir.iterdir():
-            if not record_dir.is_dir():
-                continue
-            record_count += 1
-            pages_dir = record_dir / "pages"
-            if not pages_dir.exists():
-                continue
-            page_count += sum(1 for f in pages_dir.rglob("*") if f.is_file())
+    record_count, page_count = workspace_counts(workspace)
     return {
         "slug": workspace.slug,
         "title": info.get("title"),
@@ -73,6 +94,55 @@ def _workspace_payload(workspace) -> Dict:
     }
 
 
+def _file_response(path, *, content_type: str, **kwargs) -> FileResponse:
+    # Content-Length is filled in by FileResponse from the file's size.
+    response = FileResponse(open(path, "rb"), content_type=content_type, **kwargs)
+    response.block_size = FILE_STREAM_BLOCK_SIZE
+    return response
+
+
+def _etag_matches(request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as used for GET revalidation."""
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in parse_etags(if_none_match)
+    )
+
+
+def _image_response(request, path, *, content_type: str):
+    stat = os.stat(path)
+    # Inode, mtime and size: distinct across workspaces sharing a path and across rewrites.
+    etag = f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    if _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        response["Cache-Control"] = IMAGE_CACHE_CONTROL
+        return response
+
+    response = _file_response(path, content_type=content_type)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Cache-Control"] = IMAGE_CACHE_CONTROL
+    return response
+
+
+def _accel_redirect_response(path: Path, *, content_type: str) -> Optional[HttpResponse]:
+    """Hand the file to nginx via X-Accel-Redirect; ``None`` if it lies outside WORKSPACES_ROOT."""
+    root = os.path.join(os.fspath(settings.WORKSPACES_ROOT), "")
+    path_str = os.fspath(path)
+    if not path_str.startswith(root):
+        return None
+    prefix = settings.THUMBNAIL_ACCEL_REDIRECT_PREFIX.rstrip("/")
+    response = HttpResponse(content_type=content_type)
+    response["X-Accel-Redirect"] = f"{prefix}/{quote(path_str[len(root):].replace(os.sep, '/'))}"
+    response["Cache-Control"] = IMAGE_CACHE_CONTROL
+    return response
+
+
 def _record_payload(record) -> Dict:
     return record.to_dict()
 
@@ -89,23 +159,23 @@ def available_workspaces(request):
     workspaces = [
         _workspace_payload(workspace) for workspace in list_workspaces()
     ]
-    return JsonResponse({"ok": True, "workspaces": workspaces})
+    return json_response({"ok": True, "workspaces": workspaces})
 
 
 @require_GET
 def current_workspace(request):
     workspace = get_active_workspace()
     if workspace is None:
-        return JsonResponse({"ok": True, "workspace": None})
-    return JsonResponse({"ok": True, "workspace": _workspace_payload(workspace)})
+        return json_response({"ok": True, "workspace": None})
+    return json_response({"ok": True, "workspace": _workspace_payload(workspace)})
 
 
 @csrf_exempt
 @require_POST
 def open_workspace(request):
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     slug = payload.get("workspace") or payload.get("slug")
@@ -115,17 +185,17 @@ def open_workspace(request):
     try:
         workspace = set_active_workspace(slug)
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
-    return JsonResponse({"ok": True, "workspace": _workspace_payload(workspace)})
+    return json_response({"ok": True, "workspace": _workspace_payload(workspace)})
 
 
 @csrf_exempt
 @require_POST
 def create_workspace_view(request):
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     slug = payload.get("slug")
@@ -136,9 +206,9 @@ def create_workspace_view(request):
 
     try:
         workspace = create_workspace(slug, title=title)
-        return JsonResponse({"ok": True, "workspace": _workspace_payload(workspace)}, status=201)
+        return json_response({"ok": True, "workspace": _workspace_payload(workspace)}, status=201)
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
 
 @csrf_exempt
@@ -146,7 +216,7 @@ def create_workspace_view(request):
 def import_workspace_view(request):
     upload_file = request.FILES.get("file")
     if upload_file is None:
-        return JsonResponse({"ok": False, "error": "Missing 'file' upload."}, status=400)
+        return json_response({"ok": False, "error": "Missing 'file' upload."}, status=400)
 
     workspace_name = request.POST.get("name") or request.POST.get("title") or request.POST.get("slug")
     try:
@@ -155,9 +225,9 @@ def import_workspace_view(request):
             workspace_name=workspace_name,
         )
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
-    return JsonResponse(
+    return json_response(
         {
             "ok": True,
             "workspace": _workspace_payload(result.workspace),
@@ -178,11 +248,10 @@ def export_workspace_view(request, slug: str):
         workspace = get_workspace(slug)
         archive_path = export_workspace_to_zip(workspace)
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
-    archive = archive_path.open("rb")
-    response = FileResponse(
-        archive,
+    response = _file_response(
+        archive_path,
         content_type="application/zip",
         as_attachment=True,
         filename=f"{workspace.slug}.zip",
@@ -197,18 +266,18 @@ def update_workspace(request, slug: str):
     try:
         workspace = get_workspace(slug)
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
     if request.method == "DELETE":
         try:
             delete_workspace(workspace.slug)
         except WorkspaceError as exc:
-            return JsonResponse({"ok": False, "error": str(exc)}, status=400)
-        return JsonResponse({"ok": True, "deleted": workspace.slug})
+            return json_response({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": True, "deleted": workspace.slug})
 
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     if "title" not in payload:
@@ -218,10 +287,10 @@ def update_workspace(request, slug: str):
     try:
         update_workspace_info(workspace.slug, title=title)
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     refreshed = get_workspace(slug)
-    return JsonResponse({"ok": True, "workspace": _workspace_payload(refreshed)})
+    return json_response({"ok": True, "workspace": _workspace_payload(refreshed)})
 
 
 @csrf_exempt
@@ -230,11 +299,11 @@ def records_root(request):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     if request.method == "GET":
         records = [_record_payload(record) for record in list_records(workspace)]
-        return JsonResponse({"ok": True, "records": records})
+        return json_response({"ok": True, "records": records})
 
     slug = request.POST.get("slug") or request.POST.get("name")
     title = request.POST.get("title")
@@ -259,12 +328,12 @@ def records_root(request):
                 title=title,
             )
         else:
-            return JsonResponse({"ok": False, "error": "Missing 'file' upload."}, status=400)
+            return json_response({"ok": False, "error": "Missing 'file' upload."}, status=400)
     except RecordError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     primary_record = upload_result.records[0] if upload_result.records else None
-    return JsonResponse(
+    return json_response(
         {
             "ok": True,
             "record": _record_payload(primary_record) if primary_record else None,
@@ -286,7 +355,7 @@ def record_upload_preview_view(request):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     slug = request.POST.get("slug") or request.POST.get("name")
     title = request.POST.get("title")
@@ -311,11 +380,11 @@ def record_upload_preview_view(request):
                 title=title,
             )
         else:
-            return JsonResponse({"ok": False, "error": "Missing 'file' upload."}, status=400)
+            return json_response({"ok": False, "error": "Missing 'file' upload."}, status=400)
     except RecordError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
-    return JsonResponse(
+    return json_response(
         {
             "ok": True,
             "upload_id": preview.upload_id,
@@ -330,21 +399,21 @@ def record_upload_commit_view(request):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     upload_id = payload.get("upload_id")
     try:
         upload_result = commit_staged_record_upload(workspace, upload_id=upload_id)
     except RecordError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     primary_record = upload_result.records[0] if upload_result.records else None
-    return JsonResponse(
+    return json_response(
         {
             "ok": True,
             "record": _record_payload(primary_record) if primary_record else None,
@@ -364,17 +433,17 @@ def record_upload_commit_view(request):
 @require_POST
 def record_upload_cancel_view(request):
     try:
-        payload = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     upload_id = payload.get("upload_id")
     try:
         discard_staged_record_upload(upload_id=upload_id)
     except RecordError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
-    return JsonResponse({"ok": True})
+    return json_response({"ok": True})
 
 
 def _record_upload_plan_payload(plan):
@@ -393,10 +462,20 @@ def _record_upload_plan_payload(plan):
     }
 
 
+@lru_cache(maxsize=8192)
+def _item_urls(rel_path: Path) -> Tuple[str, str, str]:
+    """``(relative_path, thumbnail_url, original_url)``; the path is quoted once and reused."""
+    posix_path = rel_path.as_posix()
+    quoted = quote(posix_path, safe="")
+    return (
+        posix_path,
+        f"/api/v1/items/thumbnail?path={quoted}",
+        f"/api/v1/items/raw?path={quoted}",
+    )
+
+
 def _item_payload(workspace, item):
-    rel_path = item.rel_path.as_posix()
-    thumbnail_url = f"/api/v1/items/thumbnail?path={quote(rel_path, safe='')}"
-    original_url = f"/api/v1/items/raw?path={quote(rel_path, safe='')}"
+    rel_path, thumbnail_url, original_url = _item_urls(item.rel_path)
     completed = get_item_completed(workspace, item.id)
     return {
         "id": item.id,
@@ -414,7 +493,7 @@ def list_items_view(request):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     record_filter = request.GET.get("record")
 
@@ -434,15 +513,23 @@ def list_items_view(request):
     query = request.GET.get("q")
     sort = request.GET.get("sort")
     try:
-        items_iter = iter_items(workspace, record_slug=record_filter)
+        if query or (sort or "").lower() == "filename":
+            paginated, total_count = filter_and_paginate_items(
+                iter_items(workspace, record_slug=record_filter),
+                query=query,
+                sort=sort,
+                page=page,
+                page_size=page_size,
+            )
+        else:
+            # Default order needs no filtering or sorting: slice the page straight out.
+            paginated, total_count = paginate_workspace_items(
+                workspace, record_slug=record_filter, page=page, page_size=page_size
+            )
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
-
-    items = filter_items(items_iter, query=query, sort=sort)
-    total_count = len(items)
-    paginated = paginate_items(items, page=page, page_size=page_size)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
-    return JsonResponse(
+    return json_response(
         {
             "ok": True,
             "items": [_item_payload(workspace, item) for item in paginated],
@@ -457,15 +544,9 @@ def list_items_view(request):
 
 def _resolve_request_path(request) -> Optional[PurePosixPath]:
     path_value = request.GET.get("path")
-    if not path_value:
+    if not path_value or _UNSAFE_REQUEST_PATH_RE.search(path_value):
         return None
-    try:
-        relative = PurePosixPath(path_value)
-    except ValueError:
-        return None
-    if relative.is_absolute() or ".." in relative.parts:
-        return None
-    return relative
+    return PurePosixPath(path_value)
 
 
 @require_GET
@@ -473,43 +554,43 @@ def item_thumbnail(request):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     relative = _resolve_request_path(request)
     if relative is None:
         return HttpResponseBadRequest("Missing or invalid 'path'.")
 
-    source = workspace.path / relative
-    if not source.exists():
+    # ensure_thumbnail stats the source itself; a missing page surfaces as FileNotFoundError.
+    try:
+        thumbnail_path = ensure_thumbnail(workspace, relative)
+        if settings.THUMBNAIL_ACCEL_REDIRECT_PREFIX:
+            # nginx then serves the bytes with sendfile and answers conditional GETs itself.
+            response = _accel_redirect_response(thumbnail_path, content_type="image/jpeg")
+            if response is not None:
+                return response
+        return _image_response(request, thumbnail_path, content_type="image/jpeg")
+    except (FileNotFoundError, NotADirectoryError):
         raise Http404("Page not found.")
 
-    thumbnail_path = ensure_thumbnail(workspace, relative)
-    return FileResponse(thumbnail_path.open("rb"), content_type="image/jpeg")
-
 
 @require_GET
 def item_original(request):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     relative = _resolve_request_path(request)
     if relative is None:
         return HttpResponseBadRequest("Missing or invalid 'path'.")
 
     source = workspace.path / relative
-    if not source.exists():
-        raise Http404("Page not found.")
-
-    content_type = "image/jpeg"
-    suffix = source.suffix.lower()
-    if suffix in {".png"}:
-        content_type = "image/png"
-    elif suffix in {".tif", ".tiff"}:
-        content_type = "image/tiff"
+    content_type = _ORIGINAL_CONTENT_TYPES.get(relative.suffix.lower(), "application/octet-stream")
 
-    return FileResponse(source.open("rb"), content_type=content_type)
+    try:
+        return _image_response(request, source, content_type=content_type)
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        raise Http404("Page not found.")
 
 
 @csrf_exempt
@@ -518,31 +599,31 @@ def record_detail_view(request, record_slug: str):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     if request.method == "DELETE":
         try:
             delete_record(workspace, record_slug)
         except RecordError as exc:
-            return JsonResponse({"ok": False, "error": str(exc)}, status=404)
-        return JsonResponse({"ok": True, "message": f"Record '{record_slug}' deleted successfully."})
+            return json_response({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": True, "message": f"Record '{record_slug}' deleted successfully."})
 
     # GET request
     try:
         record = get_record(workspace, record_slug)
     except RecordError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
     try:
         items_iter = iter_items(workspace, record_slug=record_slug)
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
     pages = [_item_payload(workspace, item) for item in items_iter]
     record_payload = _record_payload(record)
     record_payload["pages"] = pages
     record_payload["page_count"] = len(pages)
-    return JsonResponse({"ok": True, "record": record_payload})
+    return json_response({"ok": True, "record": record_payload})
 
 
 @csrf_exempt
@@ -551,20 +632,28 @@ def item_annotations_view(request, item_id: str):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
-
-    try:
-        get_item(workspace, item_id)
-    except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     if request.method == "GET":
+        try:
+            get_item(workspace, item_id)
+        except WorkspaceError as exc:
+            return json_response({"ok": False, "error": str(exc)}, status=404)
+        # Taken before the read: a concurrent save can only make the tag older than the body.
+        etag = annotations_etag(workspace, item_id)
+        if etag is not None and _etag_matches(request, etag):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
         payload = load_annotations(workspace, item_id)
-        return JsonResponse({"ok": True, **payload})
+        response = json_response({"ok": True, **payload})
+        if etag is not None:
+            response["ETag"] = etag
+        return response
 
     try:
-        data = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        data = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     if not isinstance(data, dict):
@@ -573,8 +662,12 @@ def item_annotations_view(request, item_id: str):
     if "annotations" in data and not isinstance(data["annotations"], list):
         return HttpResponseBadRequest("'annotations' must be an array.")
 
-    saved = save_annotations(workspace, item_id, data)
-    return JsonResponse({"ok": True, **saved})
+    # save_annotations checks that the page exists; no separate get_item for PUT.
+    try:
+        saved = save_annotations(workspace, item_id, data)
+    except WorkspaceError as exc:
+        return json_response({"ok": False, "error": str(exc)}, status=404)
+    return json_response({"ok": True, **saved})
 
 
 @csrf_exempt
@@ -583,21 +676,21 @@ def item_completed_view(request, item_id: str):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     try:
         get_item(workspace, item_id)
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
     try:
-        data = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        data = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     completed = bool(data.get("completed", False))
     set_item_completed(workspace, item_id, completed)
-    return JsonResponse({"ok": True, "completed": completed})
+    return json_response({"ok": True, "completed": completed})
 
 
 @csrf_exempt
@@ -606,15 +699,15 @@ def record_annotations_clear_view(request, record_slug: str):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     try:
         get_record(workspace, record_slug)
     except RecordError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
     cleared = clear_record_annotations(workspace, record_slug)
-    return JsonResponse({"ok": True, "cleared": cleared})
+    return json_response({"ok": True, "cleared": cleared})
 
 
 @csrf_exempt
@@ -623,18 +716,18 @@ def record_metadata_view(request, record_slug: str):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     try:
         # 確認 record 存在
         get_record(workspace, record_slug)
     except RecordError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=404)
 
     if request.method == "GET":
         metadata_payload = get_record_metadata_payload(workspace, record_slug)
         templates = list_metadata_templates(workspace)
-        return JsonResponse(
+        return json_response(
             {
                 "ok": True,
                 "metadata": metadata_payload,
@@ -643,8 +736,8 @@ def record_metadata_view(request, record_slug: str):
         )
 
     try:
-        data = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        data = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     if not isinstance(data, dict):
@@ -668,7 +761,7 @@ def record_metadata_view(request, record_slug: str):
         values=values,
     )
     templates = list_metadata_templates(workspace)
-    return JsonResponse(
+    return json_response(
         {
             "ok": True,
             "metadata": updated,
@@ -683,20 +776,19 @@ def item_metadata_view(request, item_id: str):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
-
-    try:
-        get_item(workspace, item_id)
-    except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=404)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     if request.method == "GET":
+        try:
+            get_item(workspace, item_id)
+        except WorkspaceError as exc:
+            return json_response({"ok": False, "error": str(exc)}, status=404)
         metadata_payload = get_item_metadata(workspace, item_id)
-        return JsonResponse({"ok": True, "metadata": metadata_payload})
+        return json_response({"ok": True, "metadata": metadata_payload})
 
     try:
-        data = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        data = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     if not isinstance(data, dict):
@@ -717,13 +809,16 @@ def item_metadata_view(request, item_id: str):
     elif isinstance(mode, bool):
         merge = mode
 
-    updated = update_item_metadata(
-        workspace,
-        item_id,
-        metadata_body,
-        merge=merge,
-    )
-    return JsonResponse({"ok": True, "metadata": updated, "mode": "merge" if merge else "replace"})
+    try:
+        updated = update_item_metadata(
+            workspace,
+            item_id,
+            metadata_body,
+            merge=merge,
+        )
+    except WorkspaceError as exc:
+        return json_response({"ok": False, "error": str(exc)}, status=404)
+    return json_response({"ok": True, "metadata": updated, "mode": "merge" if merge else "replace"})
 
 
 @csrf_exempt
@@ -732,11 +827,11 @@ def item_metadata_batch_view(request):
     try:
         workspace = _active_workspace_or_400()
     except WorkspaceError as exc:
-        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return json_response({"ok": False, "error": str(exc)}, status=400)
 
     try:
-        data = json.loads(request.body.decode("utf-8") or "{}")
-    except json.JSONDecodeError:
+        data = orjson.loads(request.body or b"{}")
+    except orjson.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON payload.")
 
     if not isinstance(data, dict):
@@ -750,22 +845,20 @@ def item_metadata_batch_view(request):
     if record_slug is not None and not isinstance(record_slug, str):
         return HttpResponseBadRequest("'record' must be a string when provided.")
 
-    normalized_items: List[str] = []
+    # 去除重複：dict 保留首次出現的順序，建構時即去重
+    normalized_items: Dict[str, None] = {}
     for raw_item in items_payload:
         if not isinstance(raw_item, str) or not raw_item.strip():
             return HttpResponseBadRequest("Each item in 'items' must be a non-empty string.")
         raw_item = raw_item.strip()
         if "/" in raw_item:
-            normalized_items.append(raw_item)
+            normalized_items[raw_item] = None
         else:
             if not record_slug:
                 return HttpResponseBadRequest(
                     "Item identifiers must include record slug (record/page) 或提供 'record' 欄位。"
                 )
-            normalized_items.append(f"{record_slug}/{raw_item}")
-
-    # 去除重複
-    normalized_items = list(dict.fromkeys(normalized_items))
+            normalized_items[f"{record_slug}/{raw_item}"] = None
 
     metadata_body = data.get("metadata")
     if metadata_body is None:
@@ -784,12 +877,12 @@ def item_metadata_batch_view(request):
 
     result = batch_update_items_metadata(
         workspace,
-        normalized_items,
+        list(normalized_items),
         metadata_body,
         merge=merge,
     )
     status_code = 207 if result["failed"] else 200
-    return JsonResponse(
+    return json_response(
         {
             "ok": True,
             "mode": "merge" if merge else "replace",